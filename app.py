@@ -4,13 +4,16 @@ Headless Dual-Mono Audio Recording System
 Main Flask Application
 """
 
-from flask import Flask, render_template, jsonify, request, send_file, redirect, url_for, flash
+from flask import Flask, Response, render_template, jsonify, request, send_file, redirect, url_for, flash
+from flask.json.provider import DefaultJSONProvider
 from flask_login import login_required, login_user, logout_user, current_user
 from pathlib import Path
 import json
 import os
 import subprocess
 import sqlite3
+import threading
+import time
 from datetime import datetime
 import recorder
 import video_recorder
@@ -19,8 +22,58 @@ import auth
 import db_utils
 import validation
 
+try:
+    import orjson
+except ImportError:  # Fall back to Flask's stdlib encoder
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes responses with orjson"""
+
+    def _option(self, indent):
+        # Non-string keys (e.g. int preset ids) are stringified like the
+        # stdlib encoder does, instead of bouncing to the slow fallback
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, default=self.default,
+                                option=self._option(kwargs.get('indent'))).decode()
+        except TypeError:
+            # Payloads orjson rejects (e.g. ints beyond 64 bits) use the stdlib path
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of
+        # decoding to str for Flask to encode again
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = orjson.dumps(obj, default=self.default,
+                                option=self._option(indent) | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__)
 
+# Serialize jsonify() responses with orjson when it is installed
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# The gevent worker copies file bodies through Python, so zero-copy downloads
+# need a fronting proxy that honours X-Sendfile (lighttpd, Apache
+# mod_xsendfile). Off by default since gunicorn serves directly; nginx is not
+# covered, as it only acts on X-Accel-Redirect, which Flask does not send.
+app.use_x_sendfile = os.environ.get('AUDIO_RECORDER_X_SENDFILE') == '1'
+
 # Session configuration
 app.secret_key = auth.generate_secret_key()
 
@@ -30,6 +83,14 @@ auth.login_manager.init_app(app)
 # Initialize auth database
 auth.init_auth_db()
 
+# Auto-backup location for import/revert (resolved once at startup)
+BACKUP_DIR = Path.home() / '.audio-recorder' / 'backups'
+BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+SCHED_BACKUP = BACKUP_DIR / 'schedules.sched.last'
+CONFIG_BACKUP = BACKUP_DIR / 'config.conf.last'
+_SCHED_BACKUP_STR = str(SCHED_BACKUP)
+_CONFIG_BACKUP_STR = str(CONFIG_BACKUP)
+
 
 def get_recordings_dir():
     """Get the configured recordings directory path"""
@@ -39,12 +100,14 @@ def get_recordings_dir():
     return recordings_dir
 
 
-# Global status tracker for audio
+# Global status tracker for audio (read and written under _status_lock).
+# start_time values here and for video are epoch seconds.
 recording_status = {
     'is_recording': False,
     'current_job': None,
     'start_time': None
 }
+_status_lock = threading.Lock()
 
 # Global status tracker for video
 video_recording_status = {
@@ -178,16 +241,18 @@ def get_status():
     """API endpoint for real-time status polling"""
     # Sync with actual recorder state to prevent desync
     actual_recording = recorder.is_recording()
-    
-    if recording_status['is_recording'] != actual_recording:
-        # State mismatch - sync to actual recorder state
-        recording_status['is_recording'] = actual_recording
-        if not actual_recording:
-            # Recording finished - clear job info
-            recording_status['current_job'] = None
-            recording_status['start_time'] = None
-    
-    return jsonify(recording_status)
+
+    with _status_lock:
+        if recording_status['is_recording'] != actual_recording:
+            # State mismatch - sync to actual recorder state
+            if actual_recording:
+                recording_status['is_recording'] = True
+            else:
+                # Recording finished - clear job info
+                recording_status.update(is_recording=False, current_job=None, start_time=None)
+        snapshot = recording_status.copy()
+
+    return jsonify(snapshot)
 
 
 @app.route('/api/record/start', methods=['POST'])
@@ -224,14 +289,17 @@ def start_recording():
     allow_override = validated['allow_override']
     capture_video = validated['capture_video']
 
-    if recording_status['is_recording']:
+    with _status_lock:
+        already_recording = recording_status['is_recording']
+    if already_recording:
         return jsonify({'error': 'Recording already in progress'}), 400
 
     try:
         job_id = recorder.start_capture(duration, allow_override=allow_override)
-        recording_status['is_recording'] = True
-        recording_status['current_job'] = job_id
-        recording_status['start_time'] = datetime.now().isoformat()
+        started_at = time.time()
+        with _status_lock:
+            recording_status.update(is_recording=True, current_job=job_id,
+                                    start_time=started_at)
 
         video_started = False
         video_error = None
@@ -241,7 +309,7 @@ def start_recording():
             try:
                 video_recorder.start_video_recording(duration)
                 video_recording_status['is_recording'] = True
-                video_recording_status['start_time'] = datetime.now().isoformat()
+                video_recording_status['start_time'] = started_at
                 video_started = True
             except Exception as ve:
                 video_error = str(ve)
@@ -275,10 +343,10 @@ def stop_recording():
     if audio_was_recording:
         try:
             recorder.stop_capture()
-            recording_status['is_recording'] = False
-            recording_status['current_job'] = None
-            recording_status['start_time'] = None
+            with _status_lock:
+                recording_status.update(is_recording=False, current_job=None, start_time=None)
             audio_stopped = True
+            _invalidate_listing_cache()
         except Exception as e:
             errors.append(f"Audio: {str(e)}")
 
@@ -556,52 +624,172 @@ def execute_cleanup():
         return jsonify({'error': str(e)}), 500
 
 
+# Cached recordings listing, keyed on (directory, directory mtime). The
+# directory mtime misses files rewritten in place, so a hit is also checked
+# against each file's size and mtime ('stamps'). Warmed when the server
+# starts and patched in place by the delete endpoints.
+_listing_cache = {'key': None, 'data': None, 'stamps': None}
+
+
+def _listing_key(recordings_dir):
+    """Cache key for the current state of a recordings directory"""
+    return (str(recordings_dir), os.stat(recordings_dir).st_mtime_ns)
+
+
+def _invalidate_listing_cache():
+    """Force the next /recordings request to rescan the directory"""
+    _listing_cache['key'] = None
+
+
+def _drop_from_listing_cache(recordings_dir, key_before, names):
+    """
+    Remove deleted files from the cached listing instead of rescanning.
+    Only valid if the cache matched the directory right before the delete.
+    """
+    if _listing_cache['key'] != key_before or recorder.is_recording():
+        _invalidate_listing_cache()
+        return
+
+    names = set(names)
+    _listing_cache['data'] = [f for f in _listing_cache['data'] if f['name'] not in names]
+    for name in names:
+        _listing_cache['stamps'].pop(name, None)
+    _listing_cache['key'] = _listing_key(recordings_dir)
+
+
+def _listing_is_current(recordings_dir, key):
+    """True if the cached listing still matches the directory and its files"""
+    if _listing_cache['key'] != key:
+        return False
+    try:
+        for name, stamp in _listing_cache['stamps'].items():
+            stat = os.stat(os.path.join(recordings_dir, name), follow_symlinks=False)
+            if (stat.st_size, stat.st_mtime_ns) != stamp:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def _store_listing(key, files, stamps):
+    """Replace the cached listing"""
+    _listing_cache['data'] = files
+    _listing_cache['stamps'] = stamps
+    _listing_cache['key'] = key
+
+
+def _scan_recordings(recordings_dir, stamps=None):
+    """
+    Build the file browser listing for a recordings directory, recording
+    each file's (size, mtime) in stamps if given
+    """
+    files = []
+
+    # scandir entries carry their type, so only one stat per file is needed
+    with os.scandir(recordings_dir) as it:
+        entries = [e for e in it
+                   if not e.name.startswith('.') and e.is_file(follow_symlinks=False)]
+    entries.sort(key=lambda e: e.name, reverse=True)
+
+    for entry in entries:
+        stat = entry.stat(follow_symlinks=False)
+        if stamps is not None:
+            stamps[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        files.append({
+            'name': entry.name,
+            'size': stat.st_size,
+            'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            'type': os.path.splitext(entry.name)[1]
+        })
+
+    return files
+
+
+def _warm_listing_cache():
+    """Scan the recordings directory once so the first page load is a cache hit"""
+    try:
+        recordings_dir = get_recordings_dir()
+        if not recorder.is_recording():
+            key = _listing_key(recordings_dir)
+            stamps = {}
+            files = _scan_recordings(recordings_dir, stamps)
+            _store_listing(key, files, stamps)
+    except OSError:
+        pass  # Storage not mounted yet; the first request will scan
+
+
+def start_listing_warmup():
+    """
+    Warm the recordings listing in the background. Called by the server at
+    startup (gunicorn's post_worker_init hook), not on import, so tools that
+    import app don't scan the recordings directory.
+    """
+    threading.Thread(target=_warm_listing_cache, name='listing-warmup', daemon=True).start()
+
+
 @app.route('/recordings')
 @login_required
 def recordings_page():
     """File browser interface"""
     recordings_dir = get_recordings_dir()
-    files = []
-    
-    for file_path in sorted(recordings_dir.glob('*'), reverse=True):
-        if file_path.is_file():
-            stat = file_path.stat()
-            files.append({
-                'name': file_path.name,
-                'size': stat.st_size,
-                'size_mb': round(stat.st_size / (1024 * 1024), 2),
-                'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                'type': file_path.suffix
-            })
-    
+    key = _listing_key(recordings_dir)
+
+    # Files grow in place while recording without touching the directory
+    # mtime, so only trust (and fill) the cache when nothing is recording
+    if recorder.is_recording():
+        files = _scan_recordings(recordings_dir)
+    elif _listing_is_current(recordings_dir, key):
+        files = _listing_cache['data']
+    else:
+        stamps = {}
+        files = _scan_recordings(recordings_dir, stamps)
+        _store_listing(key, files, stamps)
+
     return render_template('recordings.html', files=files)
 
 
+def _is_plain_filename(filename):
+    """
+    True if filename names an entry directly inside the recordings directory.
+    Checked on the string alone, so traversal attempts are rejected before
+    any filesystem call.
+    """
+    return (isinstance(filename, str) and filename not in ('', '.', '..')
+            and '/' not in filename and os.sep not in filename and '\0' not in filename)
+
+
 @app.route('/api/recordings/<filename>')
 @login_required
 def download_file(filename):
     """Download a recording file"""
     file_path = get_recordings_dir() / filename
-    if not file_path.exists() or not file_path.is_file():
+    try:
+        # ETag/Last-Modified come from send_file's own stat; conditional
+        # handling answers If-None-Match with 304 and serves Range requests
+        return send_file(file_path, as_attachment=True, conditional=True, etag=True)
+    except (FileNotFoundError, IsADirectoryError):
         return jsonify({'error': 'File not found'}), 404
-    
-    return send_file(file_path, as_attachment=True)
 
 
 @app.route('/api/recordings/<filename>', methods=['DELETE'])
 @login_required
 def delete_file(filename):
     """Delete a recording file"""
-    file_path = get_recordings_dir() / filename
-    if not file_path.exists():
-        return jsonify({'error': 'File not found'}), 404
+    if not _is_plain_filename(filename):
+        return jsonify({'error': 'Invalid filename'}), 400
 
+    recordings_dir = get_recordings_dir()
+    key_before = _listing_key(recordings_dir)
     try:
-        file_path.unlink()
-        return jsonify({'success': True})
-    except Exception as e:
+        (recordings_dir / filename).unlink()
+    except FileNotFoundError:
+        return jsonify({'error': 'File not found'}), 404
+    except OSError as e:
         return jsonify({'error': str(e)}), 500
 
+    _drop_from_listing_cache(recordings_dir, key_before, [filename])
+    return jsonify({'success': True})
+
 
 @app.route('/api/recordings/<filename>/analysis')
 @login_required
@@ -660,17 +848,30 @@ def batch_delete_files():
     deleted = []
     errors = []
 
-    for filename in files:
-        file_path = get_recordings_dir() / filename
-        if not file_path.exists():
-            errors.append(f'{filename}: not found')
-            continue
+    recordings_dir = get_recordings_dir()
+    key_before = _listing_key(recordings_dir)
 
-        try:
-            file_path.unlink()
-            deleted.append(filename)
-        except Exception as e:
-            errors.append(f'{filename}: {str(e)}')
+    # Unlink relative to one open directory fd so each delete skips the
+    # full path lookup of the recordings directory
+    dir_fd = os.open(recordings_dir, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for filename in files:
+            # dir_fd doesn't confine the path; keep unlinks inside the directory
+            if not _is_plain_filename(filename):
+                errors.append(f'{filename}: invalid filename')
+                continue
+            try:
+                os.unlink(filename, dir_fd=dir_fd)
+                deleted.append(filename)
+            except FileNotFoundError:
+                errors.append(f'{filename}: not found')
+            except Exception as e:
+                errors.append(f'{filename}: {e}')
+    finally:
+        os.close(dir_fd)
+
+    if deleted:
+        _drop_from_listing_cache(recordings_dir, key_before, deleted)
 
     return jsonify({
         'success': len(errors) == 0,
@@ -679,37 +880,91 @@ def batch_delete_files():
     })
 
 
+ZIP_CHUNK_SIZE = 1024 * 1024
+
+# Only text-like files are worth deflating; PCM audio barely shrinks
+ZIP_DEFLATE_SUFFIXES = {'.txt', '.log', '.json'}
+
+
+class _ZipStreamBuffer:
+    """
+    Write-only sink for zipfile.ZipFile.
+    It has no tell()/seek(), so zipfile writes data descriptors instead of
+    seeking back, and the bytes written so far can be drained at any point.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Return and clear everything written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _stream_zip(entries):
+    """
+    Generate a zip archive of (arcname, path) entries chunk by chunk,
+    so memory use stays at roughly one chunk regardless of archive size.
+    """
+    import zipfile
+
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+        for arcname, file_path in entries:
+            zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+            if file_path.suffix.lower() in ZIP_DEFLATE_SUFFIXES:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+            else:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            with open(file_path, 'rb') as src, zip_file.open(zinfo, 'w') as dest:
+                while True:
+                    chunk = src.read(ZIP_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            yield buffer.drain()
+    # Central directory
+    yield buffer.drain()
+
+
 @app.route('/api/recordings/batch/download', methods=['POST'])
 @login_required
 def batch_download_files():
     """Download multiple recording files as a zip archive"""
-    import zipfile
-    import tempfile
-    import io
-
     data = request.json
     files = data.get('files', [])
 
     if not files:
         return jsonify({'error': 'No files specified'}), 400
 
-    # Create zip file in memory
-    zip_buffer = io.BytesIO()
-
     try:
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for filename in files:
-                file_path = get_recordings_dir() / filename
-                if file_path.exists() and file_path.is_file():
-                    zip_file.write(file_path, filename)
-
-        zip_buffer.seek(0)
-
-        return send_file(
-            zip_buffer,
+        recordings_dir = get_recordings_dir()
+        entries = []
+        for filename in files:
+            if not _is_plain_filename(filename):
+                continue
+            file_path = recordings_dir / filename
+            if file_path.is_file():
+                entries.append((filename, file_path))
+
+        # Stream the archive as it is built instead of buffering it in memory
+        download_name = f'recordings-{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
+        return Response(
+            _stream_zip(entries),
             mimetype='application/zip',
-            as_attachment=True,
-            download_name=f'recordings-{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
+            headers={'Content-Disposition': f'attachment; filename="{download_name}"'}
         )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -721,13 +976,7 @@ def batch_download_files():
 def get_filename_config():
     """Get current filename configuration"""
     try:
-        left_row = db_utils.fetch_one(scheduler.DB_PATH,
-            "SELECT value FROM system_config WHERE key = 'channel_left_suffix'")
-        left_suffix = left_row[0] if left_row else 'L'
-
-        right_row = db_utils.fetch_one(scheduler.DB_PATH,
-            "SELECT value FROM system_config WHERE key = 'channel_right_suffix'")
-        right_suffix = right_row[0] if right_row else 'R'
+        left_suffix, right_suffix = recorder.load_channel_suffixes()
 
         return jsonify({
             'left_suffix': left_suffix,
@@ -752,18 +1001,11 @@ def save_filename_config():
         return jsonify({'error': 'Suffixes must be 10 characters or less'}), 400
     
     try:
-        def _update_config(conn, cursor):
-            cursor.execute('''
-                INSERT OR REPLACE INTO system_config (key, value, updated_at)
-                VALUES ('channel_left_suffix', ?, datetime('now'))
-            ''', (left_suffix,))
-
-            cursor.execute('''
-                INSERT OR REPLACE INTO system_config (key, value, updated_at)
-                VALUES ('channel_right_suffix', ?, datetime('now'))
-            ''', (right_suffix,))
-
-        db_utils.execute_transaction(scheduler.DB_PATH, _update_config)
+        # One transaction; also drops both keys from the config cache
+        scheduler.set_system_configs({
+            'channel_left_suffix': left_suffix,
+            'channel_right_suffix': right_suffix,
+        })
 
         return jsonify({'success': True})
     except Exception as e:
@@ -993,9 +1235,11 @@ def get_audio_devices():
     devices = recorder.get_available_audio_devices()
     current_device = scheduler.get_system_config('audio_device', 'auto')
     
+    auto_detected = recorder.auto_detect_audio_device()
+
     # Determine actual device being used
     if current_device == 'auto':
-        actual_device = recorder.auto_detect_audio_device()
+        actual_device = auto_detected
     else:
         actual_device = current_device
     
@@ -1003,7 +1247,7 @@ def get_audio_devices():
         'devices': devices,
         'current_device': current_device,
         'actual_device': actual_device,
-        'auto_detected': recorder.auto_detect_audio_device()
+        'auto_detected': auto_detected
     })
 
 
@@ -1020,12 +1264,8 @@ def get_audio_config():
         actual_device = current_device
     
     # Find device details
-    devices = recorder.get_available_audio_devices()
-    device_info = None
-    for dev in devices:
-        if dev['alsa_id'] == actual_device:
-            device_info = dev
-            break
+    devices_by_id = {dev['alsa_id']: dev for dev in recorder.get_available_audio_devices()}
+    device_info = devices_by_id.get(actual_device)
     
     return jsonify({
         'current_device': current_device,
@@ -1042,11 +1282,12 @@ def set_audio_config():
     data = request.json
     device = data.get('device', 'auto')
     
-    # Validate device exists if not auto
+    # Validate device exists if not auto (against fresh hardware, so a
+    # device plugged in within the cache window is accepted)
     if device != 'auto':
-        devices = recorder.get_available_audio_devices()
-        valid = any(d['alsa_id'] == device for d in devices)
-        if not valid:
+        recorder.invalidate_device_cache()
+        device_ids = {d['alsa_id'] for d in recorder.get_available_audio_devices()}
+        if device not in device_ids:
             return jsonify({'error': 'Invalid device - not found in system'}), 400
     
     # Save configuration
@@ -1059,21 +1300,30 @@ def set_audio_config():
     })
 
 
+# Longest test capture a request may ask for; arecord output is only
+# counted, but the request still holds a worker for the whole capture
+AUDIO_TEST_MAX_DURATION = 10
+AUDIO_TEST_CHUNK_SIZE = 64 * 1024
+
+
 @app.route('/api/audio/test', methods=['POST'])
 @login_required
 def test_audio_device():
     """Test audio device with short recording"""
     data = request.json
     device = data.get('device', 'auto')
-    duration = data.get('duration', 3)
+    try:
+        duration = int(data.get('duration', 3))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Duration must be an integer'}), 400
+    duration = max(1, min(duration, AUDIO_TEST_MAX_DURATION))
     
     # Resolve device
     if device == 'auto':
         device = recorder.auto_detect_audio_device()
     
-    # Test recording to /tmp
-    test_file = f'/tmp/audio_test_{datetime.now().strftime("%Y%m%d_%H%M%S")}.wav'
-    
+    # Test recording to stdout; only the captured byte count is needed,
+    # so nothing is written to /tmp
     cmd = [
         'arecord',
         '-D', device,
@@ -1081,16 +1331,33 @@ def test_audio_device():
         '-r', '48000',
         '-c', '2',
         '-d', str(duration),
-        test_file
+        '-'
     ]
     
     try:
-        result = subprocess.run(cmd, capture_output=True, timeout=duration+2, text=True)
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # Kill a capture that outlives its duration so the read loop ends
+        watchdog = threading.Timer(duration + 2, proc.kill)
+        watchdog.start()
+        try:
+            # Count the capture in fixed-size chunks instead of buffering it
+            file_size = 0
+            for chunk in iter(lambda: proc.stdout.read(AUDIO_TEST_CHUNK_SIZE), b''):
+                file_size += len(chunk)
+            stderr = proc.stderr.read()
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+            proc.stdout.close()
+            proc.stderr.close()
         
-        if result.returncode == 0 and Path(test_file).exists():
-            file_size = Path(test_file).stat().st_size
-            Path(test_file).unlink()  # Clean up
-            
+        if returncode < 0:
+            return jsonify({
+                'success': False,
+                'error': 'Test recording timed out'
+            }), 500
+        
+        if returncode == 0 and file_size:
             return jsonify({
                 'success': True,
                 'device': device,
@@ -1101,15 +1368,10 @@ def test_audio_device():
         else:
             return jsonify({
                 'success': False,
-                'error': result.stderr or 'Recording failed',
+                'error': stderr.decode(errors='replace') or 'Recording failed',
                 'device': device
             }), 400
             
-    except subprocess.TimeoutExpired:
-        return jsonify({
-            'success': False,
-            'error': 'Test recording timed out'
-        }), 500
     except Exception as e:
         return jsonify({
             'success': False,
@@ -1133,6 +1395,29 @@ def _get_log_file_path(log_type):
     return log_paths.get(log_type, var_log_dir / f'{log_type}.log')
 
 
+def _tail_lines(path, count, block_size=64 * 1024):
+    """Read the last `count` lines of a file by scanning backwards from the end"""
+    if count <= 0:
+        return []
+
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        chunks = []
+        newlines = 0
+        # One extra newline guarantees the first kept line is complete
+        while pos > 0 and newlines <= count:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+
+    data = b''.join(reversed(chunks))
+    return [line.decode('utf-8', 'replace') for line in data.splitlines(keepends=True)[-count:]]
+
+
 @app.route('/api/logs/paths', methods=['GET'])
 @login_required
 def get_log_paths():
@@ -1166,23 +1451,93 @@ def get_logs():
         })
 
     try:
-        # Read last N lines
-        with open(log_file, 'r') as f:
-            all_lines = f.readlines()
-            log_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+        # Read last N lines without loading the whole file
+        log_lines = _tail_lines(log_file, lines)
 
-        return jsonify({
+        response = jsonify({
             'logs': log_lines,
-            'total_lines': len(all_lines),
+            'total_lines': None,  # Not counted; that would need a full read
             'showing_lines': len(log_lines),
             'log_type': log_type,
             'file_path': str(log_file)
         })
+
+        # Log text compresses well; level 1 keeps the CPU cost negligible
+        response.vary.add('Accept-Encoding')
+        if 'gzip' in request.accept_encodings:
+            import gzip
+            response.set_data(gzip.compress(response.get_data(), compresslevel=1))
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
     except Exception as e:
         return jsonify({'error': str(e), 'file_path': str(log_file)}), 500
 
 
 # Backup/Restore API Endpoints (Refactored)
+# The tables each export type carries, parents before the tables that
+# reference them
+EXPORT_TABLES = {
+    'schedules': ('scheduled_jobs', 'recording_instances'),
+    'config': ('system_config',),
+}
+
+
+def _export_tables(dst_path, tables):
+    """
+    Write tables (schema, indexes and rows) from the schedule database into
+    a new database file, reading through ATTACH so only those tables are
+    written
+    """
+    conn = sqlite3.connect(str(dst_path), isolation_level=None)
+    try:
+        conn.execute("ATTACH DATABASE ? AS src", (str(scheduler.DB_PATH),))
+        placeholders = ','.join('?' * len(tables))
+        schema = dict(conn.execute(
+            f"SELECT name, sql FROM src.sqlite_master "
+            f"WHERE type = 'table' AND name IN ({placeholders})", tables).fetchall())
+        # Implicit indexes (UNIQUE, PRIMARY KEY) have no SQL and come back
+        # with the CREATE TABLE
+        indexes = [row[0] for row in conn.execute(
+            f"SELECT sql FROM src.sqlite_master "
+            f"WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})",
+            tables)]
+
+        with db_utils.immediate_transaction(conn):
+            for table in tables:
+                if table not in schema:
+                    continue
+                conn.execute(schema[table])
+                conn.execute(f"INSERT INTO main.{table} SELECT * FROM src.{table}")
+            for sql in indexes:
+                conn.execute(sql)
+        conn.execute("DETACH DATABASE src")
+    finally:
+        conn.close()
+
+
+def _replace_tables_from(conn, src_path, tables):
+    """
+    Replace tables' rows with those of the same tables in another database
+    file. The copy is an INSERT ... SELECT per table run entirely inside
+    SQLite, in one transaction. Tables missing from the file (older exports)
+    are left as they are.
+    """
+    # ATTACH/DETACH are not allowed inside a transaction
+    conn.execute("ATTACH DATABASE ? AS src", (str(src_path),))
+    try:
+        present = {row[0] for row in conn.execute(
+            "SELECT name FROM src.sqlite_master WHERE type = 'table'")}
+        tables = [table for table in tables if table in present]
+        with db_utils.immediate_transaction(conn):
+            # Children first, so no row is left pointing at a deleted parent
+            for table in reversed(tables):
+                conn.execute(f"DELETE FROM main.{table}")
+            for table in tables:
+                conn.execute(f"INSERT INTO main.{table} SELECT * FROM src.{table}")
+    finally:
+        conn.execute("DETACH DATABASE src")
+
+
 @app.route('/api/export/<export_type>', methods=['GET'])
 @login_required
 def export_data(export_type):
@@ -1205,25 +1560,11 @@ def export_data(export_type):
     filename = f'audio-recorder-{export_type}-{timestamp}{extension}'
     
     try:
-        # Create temporary database copy
+        # Create temporary database holding only the exported tables
         with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp:
             tmp_path = tmp.name
-        
-        import shutil
-        shutil.copy(scheduler.DB_PATH, tmp_path)
-
-        # Remove unwanted tables based on export type
-        def _cleanup_export(conn, cursor):
-            if export_type == 'schedules':
-                # Keep only schedules
-                cursor.execute("DROP TABLE IF EXISTS system_config")
-                cursor.execute("DROP TABLE IF EXISTS recording_templates")
-            else:  # config
-                # Keep only system configuration
-                cursor.execute("DROP TABLE IF EXISTS scheduled_jobs")
-                cursor.execute("DROP TABLE IF EXISTS recording_templates")
-
-        db_utils.execute_transaction(tmp_path, _cleanup_export)
+
+        _export_tables(tmp_path, EXPORT_TABLES[export_type])
 
         return send_file(tmp_path, as_attachment=True, download_name=filename)
     except Exception as e:
@@ -1253,81 +1594,35 @@ def import_data(import_type):
     
     try:
         # Create auto-backup first
-        backup_dir = Path.home() / '.audio-recorder' / 'backups'
-        backup_dir.mkdir(parents=True, exist_ok=True)
-        backup_filename = f'{import_type}{expected_ext}.last'
-        backup_path = backup_dir / backup_filename
-
-        # Backup current state
-        conn_src = None
-        conn_backup = None
+        backup_path = SCHED_BACKUP if import_type == 'schedules' else CONFIG_BACKUP
+
+        # Backup current state into a temp file first, so a failed export
+        # leaves the previous revert point in place
+        import tempfile
+        fd, tmp_backup = tempfile.mkstemp(dir=BACKUP_DIR, suffix='.tmp')
+        os.close(fd)
         try:
-            conn_src = sqlite3.connect(scheduler.DB_PATH)
-            conn_backup = sqlite3.connect(str(backup_path))
-            conn_src.backup(conn_backup)
-
-            # Remove unwanted tables from backup
-            cursor_backup = conn_backup.cursor()
-            if import_type == 'schedules':
-                cursor_backup.execute("DROP TABLE IF EXISTS system_config")
-                cursor_backup.execute("DROP TABLE IF EXISTS recording_templates")
-            else:  # config
-                cursor_backup.execute("DROP TABLE IF EXISTS scheduled_jobs")
-                cursor_backup.execute("DROP TABLE IF EXISTS recording_templates")
-
-            conn_backup.commit()
-        finally:
-            if conn_src:
-                conn_src.close()
-            if conn_backup:
-                conn_backup.close()
+            _export_tables(tmp_backup, EXPORT_TABLES[import_type])
+            os.replace(tmp_backup, backup_path)
+        except BaseException:
+            Path(tmp_backup).unlink(missing_ok=True)
+            raise
 
         # Save and process uploaded file
-        import tempfile
         with tempfile.NamedTemporaryFile(delete=False, suffix=expected_ext) as tmp:
             file.save(tmp.name)
             upload_path = tmp.name
 
         # Import data
-        conn_upload = None
-        conn_main = None
-        try:
-            conn_upload = sqlite3.connect(upload_path)
-            conn_main = sqlite3.connect(scheduler.DB_PATH)
-            cursor_main = conn_main.cursor()
-            cursor_upload = conn_upload.cursor()
-
-            if import_type == 'schedules':
-                # Clear and import schedules
-                cursor_main.execute("DELETE FROM scheduled_jobs")
-
-                # Copy scheduled_jobs
-                cursor_upload.execute("SELECT * FROM scheduled_jobs")
-                for row in cursor_upload.fetchall():
-                    placeholders = ','.join(['?' for _ in row])
-                    cursor_main.execute(f"INSERT INTO scheduled_jobs VALUES ({placeholders})", row)
-
-                # Reload scheduler
-                conn_main.commit()
-
-                scheduler.scheduler.remove_all_jobs()
-                scheduler.restore_jobs_on_startup()
-
-            else:  # config
-                # Clear and import configuration
-                cursor_main.execute("DELETE FROM system_config")
-
-                cursor_upload.execute("SELECT * FROM system_config")
-                for row in cursor_upload.fetchall():
-                    placeholders = ','.join(['?' for _ in row])
-                    cursor_main.execute(f"INSERT INTO system_config VALUES ({placeholders})", row)
+        with db_utils.write_connection(scheduler.DB_PATH) as conn:
+            _replace_tables_from(conn, upload_path, EXPORT_TABLES[import_type])
 
-                conn_main.commit()
-        finally:
-            if conn_upload:
-                conn_upload.close()
-            if conn_main:
-                conn_main.close()
+        if import_type == 'schedules':
+            # Reload scheduler
+            scheduler.scheduler.remove_all_jobs()
+            scheduler.restore_jobs_on_startup()
+        else:  # config
+            scheduler.invalidate_config_cache()
 
         return jsonify({'success': True})
     except Exception as e:
@@ -1346,51 +1641,22 @@ def revert_data(revert_type):
     if revert_type not in ['schedules', 'config']:
         return jsonify({'error': 'Invalid revert type. Use "schedules" or "config"'}), 400
     
-    extension = '.sched' if revert_type == 'schedules' else '.conf'
-    backup_path = Path.home() / '.audio-recorder' / 'backups' / f'{revert_type}{extension}.last'
+    backup_path = SCHED_BACKUP if revert_type == 'schedules' else CONFIG_BACKUP
     
     if not backup_path.exists():
         return jsonify({'error': 'No backup available'}), 404
     
     try:
-        conn_backup = None
-        conn_main = None
-        try:
-            conn_backup = sqlite3.connect(str(backup_path))
-            conn_main = sqlite3.connect(scheduler.DB_PATH)
-            cursor_main = conn_main.cursor()
-            cursor_backup = conn_backup.cursor()
-
-            if revert_type == 'schedules':
-                # Clear and restore schedules
-                cursor_main.execute("DELETE FROM scheduled_jobs")
-
-                cursor_backup.execute("SELECT * FROM scheduled_jobs")
-                for row in cursor_backup.fetchall():
-                    placeholders = ','.join(['?' for _ in row])
-                    cursor_main.execute(f"INSERT INTO scheduled_jobs VALUES ({placeholders})", row)
-
-                conn_main.commit()
-
-                # Reload scheduler
-                scheduler.scheduler.remove_all_jobs()
-                scheduler.restore_jobs_on_startup()
+        # Clear and restore from the backup
+        with db_utils.write_connection(scheduler.DB_PATH) as conn:
+            _replace_tables_from(conn, backup_path, EXPORT_TABLES[revert_type])
 
-            else:  # config
-                # Clear and restore configuration
-                cursor_main.execute("DELETE FROM system_config")
-
-                cursor_backup.execute("SELECT * FROM system_config")
-                for row in cursor_backup.fetchall():
-                    placeholders = ','.join(['?' for _ in row])
-                    cursor_main.execute(f"INSERT INTO system_config VALUES ({placeholders})", row)
-
-                conn_main.commit()
-        finally:
-            if conn_backup:
-                conn_backup.close()
-            if conn_main:
-                conn_main.close()
+        if revert_type == 'schedules':
+            # Reload scheduler
+            scheduler.scheduler.remove_all_jobs()
+            scheduler.restore_jobs_on_startup()
+        else:  # config
+            scheduler.invalidate_config_cache()
 
         return jsonify({'success': True})
     except Exception as e:
@@ -1401,11 +1667,9 @@ def revert_data(revert_type):
 @login_required
 def check_revert_available():
     """Check if revert backups exist for schedules and/or config"""
-    backup_dir = Path.home() / '.audio-recorder' / 'backups'
-
     return jsonify({
-        'schedules_available': (backup_dir / 'schedules.sched.last').exists(),
-        'config_available': (backup_dir / 'config.conf.last').exists()
+        'schedules_available': os.path.isfile(_SCHED_BACKUP_STR),
+        'config_available': os.path.isfile(_CONFIG_BACKUP_STR)
     })
 
 
@@ -1455,22 +1719,12 @@ def get_disk_space():
         scheduled_hours = 0
 
         try:
-            jobs = scheduler.get_all_jobs()
+            recurring_hours, one_time = scheduler.get_scheduled_projection()
             now = datetime.now()
 
-            for job in jobs:
-                if job.get('status') == 'pending':
-                    # Calculate hours for this job
-                    duration_hours = job.get('duration', 0) / 3600
-
-                    if job.get('is_recurring'):
-                        # For recurring jobs, estimate next 7 days worth
-                        scheduled_hours += duration_hours * 7
-                    else:
-                        # One-time job
-                        job_time = datetime.fromisoformat(job.get('start_time', ''))
-                        if job_time > now:
-                            scheduled_hours += duration_hours
+            # Only one-time jobs still in the future count
+            scheduled_hours = recurring_hours + sum(
+                hours for job_time, hours in one_time if job_time > now)
 
             # Warning if scheduled recordings would use more than available space
             scheduled_warning = scheduled_hours > hours_remaining
@@ -1543,13 +1797,13 @@ def call_camera_preset(preset_id):
 @login_required
 def get_camera_config():
     """Get camera configuration"""
+    # get_camera_config builds a fresh dict per call, so mask it in place
     config = video_recorder.get_camera_config()
 
     # Don't send password in plain text
-    config_safe = config.copy()
-    config_safe['camera_password'] = '****' if config['camera_password'] else ''
+    config['camera_password'] = '****' if config['camera_password'] else ''
 
-    return jsonify(config_safe)
+    return jsonify(config)
 
 
 @app.route('/api/camera/config', methods=['POST'])
@@ -1558,18 +1812,21 @@ def set_camera_config():
     """Save camera configuration"""
     data = request.json
 
-    # Save each config value
+    # Collect every changed value and save them in one transaction
+    updates = {}
     if 'camera_ip' in data:
-        video_recorder.set_camera_config('camera_ip', data['camera_ip'].strip())
+        updates['camera_ip'] = data['camera_ip'].strip()
 
     if 'camera_username' in data:
-        video_recorder.set_camera_config('camera_username', data['camera_username'].strip())
+        updates['camera_username'] = data['camera_username'].strip()
 
     if 'camera_password' in data and data['camera_password'] != '****':
-        video_recorder.set_camera_config('camera_password', data['camera_password'])
+        updates['camera_password'] = data['camera_password']
 
     if 'preset_names' in data:
-        video_recorder.set_preset_names(data['preset_names'])
+        updates['preset_names'] = data['preset_names']
+
+    video_recorder.set_camera_config_bulk(updates)
 
     return jsonify({'success': True, 'message': 'Camera configuration saved'})
 
@@ -1593,10 +1850,25 @@ def get_stream_info():
     return jsonify(video_recorder.get_live_stream_info())
 
 
+# Last combined video status; the camera page polls it every second
+VIDEO_STATUS_TTL = 0.25
+_video_status_cache = {'time': 0.0, 'value': None}
+
+
+def _invalidate_video_status():
+    """Force the next /api/video/status poll to re-read recorder state"""
+    _video_status_cache['value'] = None
+
+
 @app.route('/api/video/status', methods=['GET'])
 @login_required
 def get_video_status():
     """Get combined video recording and transcode status"""
+    now = time.monotonic()
+    payload = _video_status_cache['value']
+    if payload is not None and now - _video_status_cache['time'] < VIDEO_STATUS_TTL:
+        return jsonify(payload)
+
     # Sync with actual recorder state
     actual_status = video_recorder.get_video_recording_status()
     transcode_status = video_recorder.get_transcode_status()
@@ -1606,10 +1878,14 @@ def get_video_status():
     video_recording_status['current_file'] = actual_status['current_file']
     video_recording_status['start_time'] = actual_status['start_time']
 
-    return jsonify({
+    payload = {
         'recording': actual_status,
         'transcode': transcode_status
-    })
+    }
+    _video_status_cache['time'] = now
+    _video_status_cache['value'] = payload
+
+    return jsonify(payload)
 
 
 @app.route('/api/video/start', methods=['POST'])
@@ -1643,7 +1919,8 @@ def start_video_recording():
 
         video_recording_status['is_recording'] = True
         video_recording_status['current_file'] = result['file']
-        video_recording_status['start_time'] = datetime.now().isoformat()
+        video_recording_status['start_time'] = time.time()
+        _invalidate_video_status()
 
         return jsonify({
             'success': True,
@@ -1667,6 +1944,7 @@ def stop_video_recording():
         video_recording_status['is_recording'] = False
         video_recording_status['current_file'] = None
         video_recording_status['start_time'] = None
+        _invalidate_video_status()
 
         return jsonify(result)
     except Exception as e:
@@ -1692,11 +1970,13 @@ def list_video_files():
 def cancel_transcode():
     """Cancel ongoing video transcoding"""
     if video_recorder.cancel_transcode():
+        _invalidate_video_status()
         return jsonify({'success': True, 'message': 'Transcode cancelled'})
     else:
         return jsonify({'error': 'No transcoding in progress'}), 400
 
 
 if __name__ == '__main__':
+    start_listing_warmup()
     # Run on all interfaces for headless access
     app.run(host='0.0.0.0', port=5000, debug=False)
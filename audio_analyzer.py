@@ -6,16 +6,56 @@ Analyzes WAV and MP3 files to determine:
 - Mean and max dB levels per channel
 - Timestamp where max dB occurs per channel
 
-Uses FFmpeg for analysis via subprocess calls.
+Uses FFmpeg for analysis via a single subprocess call: the file is decoded
+once and one filter graph runs per-channel silence detection, whole-file
+silence detection and per-channel level measurement side by side. Silence
+detection runs on an 8 kHz resample; levels are measured at the native rate.
 """
 
+import os
 import subprocess
 import json
+import math
 import re
-from typing import Dict, List, Optional, Tuple
+import bisect
+import hashlib
+import tempfile
+import threading
+import wave
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
 
+# Finished analyses, one JSON file per (file identity, thresholds) key
+ANALYSIS_CACHE_DIR = Path.home() / '.audio-recorder' / 'analysis_cache'
+ANALYSIS_CACHE_MAX_ENTRIES = 500  # oldest entries are pruned beyond this
+
+# Part of the cache key: bump whenever the shape or meaning of an analysis
+# result changes, so entries written by older code are no longer served
+ANALYZER_VERSION = 2
+
+# Resolution of the level measurements (and so of max_db_time), in seconds
+LEVEL_WINDOW_SEC = 0.1
+
+# Upper bound on a WAV header (RIFF, fmt and ffmpeg's LIST chunks);
+# anything larger with a zero frame count has unaccounted audio data
+WAV_MAX_HEADER_BYTES = 1024
+
+# ffmpeg stderr lines kept for the error raised when analysis fails
+STDERR_TAIL_LINES = 50
+
+# FFmpeg output patterns, matched once per line of silencedetect/astats output.
+# silencedetect in mono mode prefixes its lines with "channel: N | "; lines
+# without the prefix come from the whole-file detector.
+_RE_SILENCE_CHANNEL = re.compile(r'channel: (\d+) \|')
+_RE_SILENCE_START = re.compile(r'silence_start: ([\d.]+)')
+_RE_SILENCE_END = re.compile(r'silence_end: ([\d.]+)')
+_RE_PTS = re.compile(r'pts_time:([\d.]+)')
+_RE_LEVEL = re.compile(r'lavfi\.astats\.(\d+)\.(RMS|Peak)_level=(-?inf|[-\d.]+)')
+
+
 @dataclass
 class ChannelStats:
     """Statistics for a single audio channel"""
@@ -88,19 +128,31 @@ class AudioAnalyzer:
             ValueError: If file format is not supported
         """
         # Get basic file info
-        duration, num_channels = self._get_file_info(filepath)
+        duration, num_channels, sample_rate = self._get_file_info(filepath)
+        
+        overall_silence, channel_silence, channel_levels = self._run_analysis(
+            filepath, num_channels, sample_rate
+        )
         
         # Analyze each channel independently
         channel_stats = []
         for channel_num in range(num_channels):
-            stats = self._analyze_channel(filepath, channel_num, duration)
-            channel_stats.append(stats)
+            silence_periods = channel_silence.get(channel_num, [])
+            mean_db, max_db, max_db_time = self._get_db_stats(
+                channel_levels.get(channel_num, []), silence_periods
+            )
+            channel_stats.append(ChannelStats(
+                channel_number=channel_num,
+                non_silent_percentage=self._non_silent_percentage(silence_periods, duration),
+                mean_db=mean_db,
+                max_db=max_db,
+                max_db_time=max_db_time,
+                total_duration=duration
+            ))
         
         # Calculate overall non-silent percentage (aggregate across all channels)
         # A section is non-silent if ANY channel is non-silent
-        overall_non_silent_pct = self._calculate_overall_non_silent_percentage(
-            filepath, duration, num_channels
-        )
+        overall_non_silent_pct = self._non_silent_percentage(overall_silence, duration)
         
         return AudioAnalysisResult(
             filename=filepath,
@@ -109,17 +161,23 @@ class AudioAnalyzer:
             overall_non_silent_percentage=overall_non_silent_pct
         )
     
-    def _get_file_info(self, filepath: str) -> Tuple[float, int]:
+    def _get_file_info(self, filepath: str) -> Tuple[float, int, int]:
         """
-        Get duration and number of channels from audio file.
+        Get duration, number of channels and sample rate from audio file.
         
         Returns:
-            Tuple of (duration_seconds, num_channels)
+            Tuple of (duration_seconds, num_channels, sample_rate)
         """
+        # Recorder output is plain PCM WAV; its header has everything we need
+        if filepath.lower().endswith('.wav'):
+            info = self._wav_header_info(filepath)
+            if info is not None:
+                return info
+        
         cmd = [
             'ffprobe',
             '-v', 'error',
-            '-show_entries', 'stream=duration,channels',
+            '-show_entries', 'stream=duration,channels,sample_rate',
             '-of', 'json',
             filepath
         ]
@@ -133,144 +191,244 @@ class AudioAnalyzer:
         stream = data['streams'][0]
         duration = float(stream['duration'])
         channels = int(stream['channels'])
+        sample_rate = int(stream.get('sample_rate') or 0)
         
-        return duration, channels
+        return duration, channels, sample_rate
     
-    def _analyze_channel(self, filepath: str, channel_num: int, 
-                        duration: float) -> ChannelStats:
+    def _wav_header_info(self, filepath: str) -> Optional[Tuple[float, int, int]]:
         """
-        Analyze a single channel for silence and dB levels.
+        Read duration, channels and sample rate from a WAV header.
         
-        Args:
-            filepath: Path to audio file
-            channel_num: Channel number (0-indexed)
-            duration: Total duration of file in seconds
-            
         Returns:
-            ChannelStats for the channel
+            Tuple of (duration_seconds, num_channels, sample_rate), or None
+            if the wave module can't parse the file (e.g. float or
+            extensible-format WAV), in which case ffprobe is used instead
         """
-        # Detect silence periods for this channel
-        silence_periods = self._detect_silence(filepath, channel_num)
-        
-        # Calculate non-silent percentage
-        total_silence = sum(end - start for start, end in silence_periods)
-        non_silent_duration = duration - total_silence
-        non_silent_pct = (non_silent_duration / duration) * 100.0 if duration > 0 else 0.0
-        
-        # Get dB statistics for non-silent portions
-        mean_db, max_db, max_db_time = self._get_db_stats(
-            filepath, channel_num, silence_periods, duration
-        )
-        
-        return ChannelStats(
-            channel_number=channel_num,
-            non_silent_percentage=non_silent_pct,
-            mean_db=mean_db,
-            max_db=max_db,
-            max_db_time=max_db_time,
-            total_duration=duration
-        )
+        try:
+            with wave.open(filepath, 'rb') as wav:
+                sample_rate = wav.getframerate()
+                nframes = wav.getnframes()
+                if sample_rate <= 0:
+                    return None
+                # ffmpeg fills in the data size when it finalizes the file;
+                # one killed before that leaves 0 in a header followed by
+                # audio, so let ffprobe work out the real duration
+                if nframes == 0 and os.path.getsize(filepath) > WAV_MAX_HEADER_BYTES:
+                    return None
+                return nframes / sample_rate, wav.getnchannels(), sample_rate
+        except (wave.Error, EOFError):
+            return None
     
-    def _detect_silence(self, filepath: str, channel_num: int) -> List[Tuple[float, float]]:
+    def _run_analysis(self, filepath: str, num_channels: int, sample_rate: int = 0):
         """
-        Detect silence periods in a specific channel.
+        Decode the file once and collect silence periods and levels.
         
         Args:
             filepath: Path to audio file
-            channel_num: Channel number (0-indexed)
+            num_channels: Number of channels in the file
+            sample_rate: Input sample rate in Hz (0 if unknown)
             
         Returns:
-            List of (start_time, end_time) tuples for silent periods
+            Tuple of (overall_silence_periods, {channel: silence_periods},
+            {channel: [(time, rms_db, peak_db), ...]})
         """
-        # Extract single channel and detect silence
+        silence = (f'silencedetect=noise={self.silence_threshold_db}dB:'
+                   f'd={self.silence_duration_sec}')
+        
+        # astats measures fixed LEVEL_WINDOW_SEC windows instead of
+        # decoder-sized frames and reports only the two per-channel levels
+        # we read, which keeps the metadata dump (and our parsing of it) small.
+        window = ''
+        if sample_rate > 0:
+            window_samples = max(1, int(sample_rate * LEVEL_WINDOW_SEC))
+            window = f'asetnsamples=n={window_samples}:p=0,'
+        
+        # One decode feeds three branches: silencedetect in mono mode gives
+        # each channel's silence, a second silencedetect gives the periods
+        # where ALL channels are silent, and astats measures each channel at
+        # the native rate. Silence events are logged to stderr, astats
+        # metadata goes to stdout.
+        # For a mono file both silence figures are the same thing, so only
+        # the per-channel detector runs.
+        if num_channels == 1:
+            silence_graph = f'[sil]aresample=8000,{silence}:mono=1,anullsink;'
+        else:
+            silence_graph = (f'[sil]aresample=8000,asplit[chs][all];'
+                             f'[chs]{silence}:mono=1,anullsink;'
+                             f'[all]{silence},anullsink;')
+        
+        # -nostats keeps progress reports out of stderr, where one could land
+        # between a mono silencedetect event's channel prefix and its text
         cmd = [
             'ffmpeg',
+            '-hide_banner',
+            '-nostats',
             '-i', filepath,
-            '-af', f'pan=mono|c0=c{channel_num},'
-                   f'silencedetect=noise={self.silence_threshold_db}dB:'
-                   f'd={self.silence_duration_sec}',
+            '-vn',
+            '-filter_complex',
+                   f'asplit[sil][lvl];'
+                   f'{silence_graph}'
+                   f'[lvl]{window}astats=metadata=1:reset=1:'
+                   f'measure_perchannel=RMS_level+Peak_level:measure_overall=none,'
+                   f'ametadata=print:file=-',
             '-f', 'null',
             '-'
         ]
         
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, bufsize=1)
         
-        # Parse silence detection output from stderr
-        silence_periods = []
-        silence_start = None
+        # Parse both streams while ffmpeg runs; stderr gets its own thread so
+        # neither pipe can fill up and stall the process. The last stderr
+        # lines are kept to explain a failure.
+        silence_result = []
+        stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
         
-        for line in result.stdout.split('\n'):
+        def _tee_stderr():
+            for line in proc.stderr:
+                stderr_tail.append(line)
+                yield line
+        
+        stderr_reader = threading.Thread(
+            target=lambda: silence_result.append(self._parse_silence_periods(_tee_stderr())),
+            daemon=True
+        )
+        stderr_reader.start()
+        channel_levels = self._parse_levels(proc.stdout)
+        stderr_reader.join()
+        returncode = proc.wait()
+        
+        # Empty levels and silence from a failed run would otherwise pass
+        # for a valid (all-silent) analysis
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=''.join(stderr_tail))
+        
+        overall_silence, channel_silence = silence_result[0] if silence_result else ([], {})
+        if num_channels == 1:
+            overall_silence = channel_silence.get(0, [])
+        
+        return overall_silence, channel_silence, channel_levels
+    
+    def _parse_silence_periods(self, lines: Iterable[str]):
+        """
+        Parse silencedetect log output into silence periods.
+        
+        Args:
+            lines: FFmpeg log lines (e.g. a process pipe) containing silencedetect output
+            
+        Returns:
+            Tuple of (overall_periods, {channel: periods}), each a list of
+            (start_time, end_time) tuples for silent periods
+        """
+        overall_periods = []
+        channel_periods = {}
+        silence_starts = {}
+        
+        for line in lines:
+            if 'silence_' not in line:
+                continue
+            
+            channel_match = _RE_SILENCE_CHANNEL.search(line)
+            channel = int(channel_match.group(1)) if channel_match else None
+            
             if 'silence_start' in line:
-                match = re.search(r'silence_start: ([\d.]+)', line)
+                match = _RE_SILENCE_START.search(line)
                 if match:
-                    silence_start = float(match.group(1))
-            elif 'silence_end' in line and silence_start is not None:
-                match = re.search(r'silence_end: ([\d.]+)', line)
+                    silence_starts[channel] = float(match.group(1))
+            elif 'silence_end' in line and channel in silence_starts:
+                match = _RE_SILENCE_END.search(line)
                 if match:
-                    silence_end = float(match.group(1))
-                    silence_periods.append((silence_start, silence_end))
-                    silence_start = None
+                    period = (silence_starts.pop(channel), float(match.group(1)))
+                    if channel is None:
+                        overall_periods.append(period)
+                    else:
+                        channel_periods.setdefault(channel, []).append(period)
         
-        return silence_periods
+        return overall_periods, channel_periods
     
-    def _get_db_stats(self, filepath: str, channel_num: int,
-                     silence_periods: List[Tuple[float, float]],
-                     duration: float) -> Tuple[float, float, float]:
+    def _parse_levels(self, lines: Iterable[str]) -> Dict[int, List[Tuple[float, Optional[float], Optional[float]]]]:
+        """
+        Parse astats metadata into per-channel, per-window levels.
+        
+        Args:
+            lines: ametadata print output (e.g. a process pipe) from the astats filter
+            
+        Returns:
+            Dict of channel number (0-indexed) to a list of
+            (time, rms_db, peak_db) tuples, one per window
+        """
+        levels = {}
+        current_time = 0.0
+        frame = {}
+        
+        def flush():
+            for channel, (rms_db, peak_db) in frame.items():
+                levels.setdefault(channel, []).append((current_time, rms_db, peak_db))
+            frame.clear()
+        
+        for line in lines:
+            # Extract timestamp (pts_time); it starts a new window
+            pts_match = _RE_PTS.search(line)
+            if pts_match:
+                flush()
+                current_time = float(pts_match.group(1))
+                continue
+            
+            # Extract RMS (mean) or Peak (max) level; astats numbers channels from 1
+            level_match = _RE_LEVEL.search(line)
+            if level_match:
+                channel = int(level_match.group(1)) - 1
+                rms_db, peak_db = frame.get(channel, (None, None))
+                value = float(level_match.group(3))
+                if level_match.group(2) == 'RMS':
+                    rms_db = value
+                else:
+                    peak_db = value
+                frame[channel] = (rms_db, peak_db)
+        
+        flush()
+        
+        return levels
+    
+    def _get_db_stats(self, levels: List[Tuple[float, Optional[float], Optional[float]]],
+                     silence_periods: List[Tuple[float, float]]) -> Tuple[float, float, float]:
         """
         Calculate mean and max dB levels for non-silent portions.
         
         Args:
-            filepath: Path to audio file
-            channel_num: Channel number (0-indexed)
+            levels: Per-window (time, rms_db, peak_db) tuples for one channel
             silence_periods: List of silent time periods to exclude
-            duration: Total duration
             
         Returns:
             Tuple of (mean_db, max_db, max_db_time)
         """
-        # Build filter to exclude silence periods and get stats
-        # We'll use astats filter to get RMS (mean) and peak (max) levels
-        cmd = [
-            'ffmpeg',
-            '-i', filepath,
-            '-af', f'pan=mono|c0=c{channel_num},astats=metadata=1:reset=1,ametadata=print:file=-',
-            '-f', 'null',
-            '-'
-        ]
+        # Silence periods come out of silencedetect in time order and never
+        # overlap, so a frame is silent iff the last period starting at or
+        # before it has not ended yet.
+        starts = [start for start, end in silence_periods]
+        ends = [end for start, end in silence_periods]
         
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        
-        # Parse astats output to collect dB values over time
         rms_values = []
         peak_values = []
         max_peak = -float('inf')
         max_peak_time = 0.0
-        current_time = 0.0
         
-        for line in result.stdout.split('\n'):
-            # Extract timestamp (pts_time)
-            pts_match = re.search(r'pts_time:([\d.]+)', line)
-            if pts_match:
-                current_time = float(pts_match.group(1))
+        for frame_time, rms_db, peak_db in levels:
+            # Skip frames inside a silent period
+            idx = bisect.bisect_right(starts, frame_time) - 1
+            if idx >= 0 and ends[idx] >= frame_time:
+                continue
             
-            # Extract RMS level (mean)
-            rms_match = re.search(r'lavfi\.astats\.Overall\.RMS_level=([-\d.]+)', line)
-            if rms_match:
-                rms_db = float(rms_match.group(1))
-                # Check if this time is in a non-silent period
-                if not self._is_in_silence(current_time, silence_periods):
-                    rms_values.append(rms_db)
+            # astats reports digital silence as -inf; leave it out so one
+            # silent window cannot drag the mean to -inf
+            if rms_db is not None and math.isfinite(rms_db):
+                rms_values.append(rms_db)
             
-            # Extract Peak level (max)
-            peak_match = re.search(r'lavfi\.astats\.Overall\.Peak_level=([-\d.]+)', line)
-            if peak_match:
-                peak_db = float(peak_match.group(1))
-                # Check if this time is in a non-silent period
-                if not self._is_in_silence(current_time, silence_periods):
-                    peak_values.append(peak_db)
-                    if peak_db > max_peak:
-                        max_peak = peak_db
-                        max_peak_time = current_time
+            if peak_db is not None and math.isfinite(peak_db):
+                peak_values.append(peak_db)
+                if peak_db > max_peak:
+                    max_peak = peak_db
+                    max_peak_time = frame_time
         
         # Calculate mean RMS (which represents mean dB)
         mean_db = sum(rms_values) / len(rms_values) if rms_values else -float('inf')
@@ -278,65 +436,24 @@ class AudioAnalyzer:
         
         return mean_db, max_db, max_peak_time
     
-    def _is_in_silence(self, time: float, silence_periods: List[Tuple[float, float]]) -> bool:
-        """Check if a given time falls within any silence period"""
-        for start, end in silence_periods:
-            if start <= time <= end:
-                return True
-        return False
-    
-    def _calculate_overall_non_silent_percentage(self, filepath: str, 
-                                                 duration: float,
-                                                 num_channels: int) -> float:
+    def _non_silent_percentage(self, silence_periods: List[Tuple[float, float]],
+                               duration: float) -> float:
         """
-        Calculate overall non-silent percentage considering all channels together.
-        A moment is non-silent if ANY channel is non-silent.
+        Calculate the percentage of the file not covered by silence periods.
         
         Args:
-            filepath: Path to audio file
+            silence_periods: List of silent time periods
             duration: Total duration
-            num_channels: Number of channels
             
         Returns:
-            Overall non-silent percentage
+            Non-silent percentage
         """
-        # Run silencedetect on the full stereo/multi-channel file
-        # This will detect silence only when ALL channels are silent
-        cmd = [
-            'ffmpeg',
-            '-i', filepath,
-            '-af', f'silencedetect=noise={self.silence_threshold_db}dB:'
-                   f'd={self.silence_duration_sec}',
-            '-f', 'null',
-            '-'
-        ]
-        
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        
-        # Parse silence periods
-        silence_periods = []
-        silence_start = None
-        
-        for line in result.stdout.split('\n'):
-            if 'silence_start' in line:
-                match = re.search(r'silence_start: ([\d.]+)', line)
-                if match:
-                    silence_start = float(match.group(1))
-            elif 'silence_end' in line and silence_start is not None:
-                match = re.search(r'silence_end: ([\d.]+)', line)
-                if match:
-                    silence_end = float(match.group(1))
-                    silence_periods.append((silence_start, silence_end))
-                    silence_start = None
-        
-        # Calculate non-silent percentage
         total_silence = sum(end - start for start, end in silence_periods)
         non_silent_duration = duration - total_silence
         non_silent_pct = (non_silent_duration / duration) * 100.0 if duration > 0 else 0.0
         
         return non_silent_pct
 
-
 def analyze_audio_file(filepath: str, 
                       silence_threshold_db: float = -60.0,
                       silence_duration_sec: float = 2.0) -> Dict:
@@ -358,9 +475,66 @@ def analyze_audio_file(filepath: str,
         ...     print(f"Channel {channel['channel']}: Max {channel['max_db']:.1f} dB "
         ...           f"at {channel['max_db_time']:.1f}s")
     """
+    # Results are cached on disk; mtime and size are part of the key, so a
+    # rewritten file simply misses the cache, as does a result from an older
+    # ANALYZER_VERSION.
+    st = os.stat(filepath)
+    key = hashlib.sha1(
+        f"{ANALYZER_VERSION}|{os.path.abspath(filepath)}|{st.st_mtime_ns}|{st.st_size}|"
+        f"{silence_threshold_db}|{silence_duration_sec}".encode()
+    ).hexdigest()
+    cache_file = ANALYSIS_CACHE_DIR / f"{key}.json"
+    
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
     analyzer = AudioAnalyzer(silence_threshold_db, silence_duration_sec)
-    result = analyzer.analyze_file(filepath)
-    return result.to_dict()
+    result = analyzer.analyze_file(filepath).to_dict()
+    
+    # A failed ffmpeg run raises before this point; an analysis that still
+    # came back empty isn't worth keeping for this file either
+    if result['channels'] and result['total_duration'] > 0:
+        _write_cache_entry(cache_file, result)
+    
+    return result
+
+
+def _write_cache_entry(cache_file: Path, result: Dict):
+    """
+    Store an analysis in the disk cache and prune the oldest entries beyond
+    ANALYSIS_CACHE_MAX_ENTRIES. A failed cache write is not an analysis failure.
+    """
+    # Write atomically so a concurrent reader never sees a partial file
+    try:
+        ANALYSIS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=ANALYSIS_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return
+    
+    # Runs once per new analysis, so a directory scan here is cheap
+    try:
+        with os.scandir(ANALYSIS_CACHE_DIR) as it:
+            entries = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith('.json')]
+    except OSError:
+        return
+    excess = len(entries) - ANALYSIS_CACHE_MAX_ENTRIES
+    if excess > 0:
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
 
 
 if __name__ == '__main__':
@@ -6,11 +6,18 @@ Handles user management and session authentication
 
 import sqlite3
 import secrets
+from functools import lru_cache
 from pathlib import Path
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import LoginManager, UserMixin
 import db_utils
 
+try:
+    import gevent.monkey
+    import gevent.hub
+except ImportError:  # Not running under gunicorn's gevent worker
+    gevent = None
+
 # Database path - same directory as scheduler database
 AUTH_DB_PATH = Path.home() / '.audio-recorder' / 'auth.db'
 
@@ -20,6 +27,30 @@ login_manager.login_view = 'login'
 login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'info'
 
+# Set once an admin account exists; users are never removed, so it stays set
+_setup_complete = False
+
+# Query text is kept constant so the pooled connections' statement caches
+# can reuse the compiled statements; user lookups run on every
+# authenticated request
+_SELECT_USER_BY_ID = 'SELECT id, username, password_hash FROM users WHERE id = ?'
+_SELECT_USER_BY_USERNAME = 'SELECT id, username, password_hash FROM users WHERE username = ?'
+_COUNT_USERS = 'SELECT COUNT(*) FROM users'
+
+
+def _offload(func, *args):
+    """
+    Run a CPU-heavy call (password hashing) without stalling the server.
+
+    gunicorn runs a single gevent worker, so a 100+ ms scrypt hash on the
+    event loop holds up every other request. hashlib releases the GIL while
+    hashing, so under gevent the call goes to the hub's native thread pool;
+    otherwise it runs inline.
+    """
+    if gevent is not None and gevent.monkey.is_module_patched('threading'):
+        return gevent.hub.get_hub().threadpool.apply(func, args)
+    return func(*args)
+
 
 class User(UserMixin):
     """User model for Flask-Login"""
@@ -31,14 +62,12 @@ class User(UserMixin):
 
     def check_password(self, password):
         """Verify password against stored hash"""
-        return check_password_hash(self.password_hash, password)
+        return _offload(check_password_hash, self.password_hash, password)
 
     @staticmethod
     def get_by_id(user_id):
         """Load user by ID"""
-        row = db_utils.fetch_one(AUTH_DB_PATH,
-            'SELECT id, username, password_hash FROM users WHERE id = ?',
-            (user_id,))
+        row = db_utils.fetch_one(AUTH_DB_PATH, _SELECT_USER_BY_ID, (user_id,))
 
         if row:
             return User(row[0], row[1], row[2])
@@ -47,9 +76,7 @@ class User(UserMixin):
     @staticmethod
     def get_by_username(username):
         """Load user by username"""
-        row = db_utils.fetch_one(AUTH_DB_PATH,
-            'SELECT id, username, password_hash FROM users WHERE username = ?',
-            (username,))
+        row = db_utils.fetch_one(AUTH_DB_PATH, _SELECT_USER_BY_USERNAME, (username,))
 
         if row:
             return User(row[0], row[1], row[2])
@@ -58,7 +85,8 @@ class User(UserMixin):
     @staticmethod
     def create(username, password):
         """Create new user"""
-        password_hash = generate_password_hash(password)
+        global _setup_complete
+        password_hash = _offload(generate_password_hash, password)
 
         try:
             def _create_user(conn, cursor):
@@ -69,6 +97,8 @@ class User(UserMixin):
                 return cursor.lastrowid
 
             user_id = db_utils.execute_transaction(AUTH_DB_PATH, _create_user)
+            _setup_complete = True
+            _get_user_cached.cache_clear()
             return User(user_id, username, password_hash)
         except sqlite3.IntegrityError:
             return None
@@ -76,24 +106,30 @@ class User(UserMixin):
     @staticmethod
     def update_password(username, new_password):
         """Update user password"""
-        password_hash = generate_password_hash(new_password)
+        password_hash = _offload(generate_password_hash, new_password)
 
         db_utils.execute_query(AUTH_DB_PATH,
             'UPDATE users SET password_hash = ? WHERE username = ?',
             (password_hash, username), commit=True)
+        _get_user_cached.cache_clear()
 
     @staticmethod
     def count_users():
         """Count total users in database"""
-        row = db_utils.fetch_one(AUTH_DB_PATH,
-            'SELECT COUNT(*) FROM users')
+        row = db_utils.fetch_one(AUTH_DB_PATH, _COUNT_USERS)
         return row[0] if row else 0
 
 
+@lru_cache(maxsize=256)
+def _get_user_cached(user_id):
+    """User.get_by_id, memoized; cleared whenever a user row changes"""
+    return User.get_by_id(user_id)
+
+
 @login_manager.user_loader
 def load_user(user_id):
     """Flask-Login user loader callback"""
-    return User.get_by_id(int(user_id))
+    return _get_user_cached(int(user_id))
 
 
 def init_auth_db():
@@ -132,5 +168,10 @@ def generate_secret_key():
 
 def needs_setup():
     """Check if initial setup (admin user creation) is needed"""
+    global _setup_complete
+    if _setup_complete:
+        return False
+
     init_auth_db()
-    return User.count_users() == 0
+    _setup_complete = User.count_users() > 0
+    return not _setup_complete
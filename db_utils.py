@@ -6,22 +6,160 @@ Provides safe database connection management with automatic cleanup
 
 import sqlite3
 import logging
-from contextlib import contextmanager
+import threading
+import queue
+import atexit
+from contextlib import contextmanager, nullcontext
 from typing import Optional, Callable, Any
 
 logger = logging.getLogger('db_utils')
 
+# Database files already switched to WAL; journal_mode persists in the file,
+# so it only needs setting once per path per process
+_wal_paths = set()
+_wal_paths_lock = threading.Lock()
+
+
+def _configure_connection(conn, db_path):
+    """Apply journal and per-connection PRAGMAs to a fresh connection"""
+    if str(db_path) == ':memory:':
+        return
+
+    key = str(db_path)
+    if key not in _wal_paths:
+        with _wal_paths_lock:
+            if key not in _wal_paths:
+                conn.execute('PRAGMA journal_mode=WAL')
+                _wal_paths.add(key)
+
+    # Per-connection settings. The busy timeout is already set by
+    # sqlite3.connect(timeout=...).
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-16000')  # 16 MiB page cache (default ~2 MiB)
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+
+
+# Prepared statements kept per pooled connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Idle connections per (db_path, timeout, row_factory, readonly). Opening a
+# connection means opening the database, -wal and -shm files and re-running
+# the PRAGMAs, which costs more than the short queries most callers run.
+# Keeping separate pools per row factory means the factory is set once, at
+# connect time. fetch_one/fetch_all use query_only reader connections, which
+# under WAL never wait on a writer.
+POOL_SIZE = 8
+_pools = {}
+_pools_lock = threading.Lock()
+
+# One writer per database at a time. SQLite allows a single writer anyway;
+# queueing on a lock here replaces the busy handler's sleep-and-retry.
+_writer_locks = {}
+
+# Run PRAGMA optimize every this many returns of a pooled connection (and
+# when idle connections are closed) so the planner's statistics keep up as
+# tables grow. It's a no-op when nothing has changed.
+OPTIMIZE_EVERY = 256
+
+
+class _PooledConnection(sqlite3.Connection):
+    """sqlite3 connection that counts how often it's been returned to a pool"""
+    releases = 0
+    readonly = False
+
+
+def _get_pool(db_path, timeout, row_factory=None, readonly=False):
+    """Get (creating if needed) the idle-connection queue for a database"""
+    key = (str(db_path), timeout, row_factory, readonly)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(key, queue.Queue(maxsize=POOL_SIZE))
+    return pool
+
+
+def _writer_lock(db_path):
+    """Get (creating if needed) the in-process write lock for a database"""
+    key = str(db_path)
+    lock = _writer_locks.get(key)
+    if lock is None:
+        with _pools_lock:
+            lock = _writer_locks.setdefault(key, threading.RLock())
+    return lock
+
+
+def _optimize(conn, db_path):
+    """
+    Run PRAGMA optimize on a writer connection. It can write sqlite_stat1, so
+    it runs under the database's write lock and is skipped while another
+    write holds it. query_only readers can't run it at all.
+    """
+    if conn.readonly:
+        return
+    lock = _writer_lock(db_path)
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        conn.execute('PRAGMA optimize')
+    finally:
+        lock.release()
+
+
+def _release(pool, conn, db_path):
+    """Reset a connection and return it to its pool (or close it if full)"""
+    try:
+        # Anything the caller didn't commit is discarded, as closing would
+        if conn.in_transaction:
+            conn.rollback()
+        conn.isolation_level = ''
+        conn.releases += 1
+        if conn.releases % OPTIMIZE_EVERY == 0:
+            _optimize(conn, db_path)
+        pool.put_nowait(conn)
+    except (sqlite3.Error, queue.Full):
+        try:
+            conn.close()
+        except Exception as close_error:
+            logger.error(f"Error closing database connection: {close_error}")
+
+
+def close_all_pools():
+    """Close every idle pooled connection (e.g. at shutdown)"""
+    with _pools_lock:
+        pools = list(_pools.items())
+        _pools.clear()
+
+    for (db_path, *_), pool in pools:
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                try:
+                    _optimize(conn, db_path)
+                finally:
+                    conn.close()
+            except Exception as close_error:
+                logger.error(f"Error closing database connection: {close_error}")
+
+
+atexit.register(close_all_pools)
+
 
 @contextmanager
-def get_db_connection(db_path, timeout=10.0, row_factory=None):
+def get_db_connection(db_path, timeout=10.0, row_factory=None, readonly=False):
     """
-    Context manager for safe database connections.
-    Ensures connection is always closed, even if exceptions occur.
+    Context manager for pooled database connections.
+    Connections are reused across calls; on exit any uncommitted work is
+    rolled back and the connection goes back to the pool.
 
     Args:
         db_path: Path to SQLite database file
         timeout: Connection timeout in seconds (default: 10.0)
         row_factory: Optional row factory (e.g., sqlite3.Row)
+        readonly: Borrow a query_only reader connection
 
     Yields:
         sqlite3.Connection: Database connection object
@@ -32,28 +170,79 @@ def get_db_connection(db_path, timeout=10.0, row_factory=None):
             cursor.execute("SELECT * FROM table")
             conn.commit()
     """
-    conn = None
+    pool = _get_pool(db_path, timeout, row_factory, readonly)
     try:
-        conn = sqlite3.connect(db_path, timeout=timeout)
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE,
+                               factory=_PooledConnection)
+        _configure_connection(conn, db_path)
+        if readonly:
+            conn.execute('PRAGMA query_only=1')
+            conn.readonly = True
         if row_factory:
             conn.row_factory = row_factory
+
+    try:
         yield conn
     except Exception as e:
-        if conn:
-            try:
-                conn.rollback()
-            except Exception as rollback_error:
-                logger.error(f"Error during rollback: {rollback_error}")
+        try:
+            conn.rollback()
+        except Exception as rollback_error:
+            logger.error(f"Error during rollback: {rollback_error}")
         raise
     finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception as close_error:
-                logger.error(f"Error closing database connection: {close_error}")
+        _release(pool, conn, db_path)
+
+
+@contextmanager
+def immediate_transaction(conn):
+    """
+    Context manager that wraps a block in BEGIN IMMEDIATE ... COMMIT.
+    Takes the write lock up front instead of upgrading from a read lock
+    mid-transaction. The connection must be in autocommit mode
+    (isolation_level=None); rolls back if the block raises.
+
+    Args:
+        conn: sqlite3.Connection with isolation_level=None
+
+    Example:
+        with immediate_transaction(conn):
+            conn.execute("DELETE FROM table")
+            conn.execute("INSERT INTO table VALUES (?)", (1,))
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+@contextmanager
+def write_connection(db_path, timeout=10.0):
+    """
+    Borrow a pooled connection in autocommit mode while holding the
+    database's write lock. Wrap the writes in immediate_transaction.
+
+    Args:
+        db_path: Path to SQLite database file
+        timeout: Connection timeout in seconds
+
+    Example:
+        with write_connection(DB_PATH) as conn:
+            with immediate_transaction(conn):
+                conn.execute("DELETE FROM table")
+    """
+    with _writer_lock(db_path), get_db_connection(db_path, timeout=timeout) as conn:
+        conn.isolation_level = None
+        yield conn
 
 
-def execute_query(db_path, query, params=None, commit=False, row_factory=None, timeout=10.0):
+def execute_query(db_path, query, params=None, commit=False, row_factory=None, timeout=10.0,
+                  fetch=None):
     """
     Execute a single query with automatic connection management.
 
@@ -64,37 +253,42 @@ def execute_query(db_path, query, params=None, commit=False, row_factory=None, t
         commit: Whether to commit the transaction
         row_factory: Optional row factory (e.g., sqlite3.Row)
         timeout: Connection timeout in seconds
+        fetch: True to return rows, False to return None; by default rows
+            are returned whenever the statement produced a result set
 
     Returns:
-        List of rows for SELECT queries, None for other queries
+        List of rows for queries that return them, None for other queries
 
     Example:
         # SELECT query
-        rows = execute_query(DB_PATH, "SELECT * FROM users WHERE id = ?", (1,))
+        rows = execute_query(DB_PATH, "SELECT * FROM users WHERE id = ?", (1,), fetch=True)
 
         # INSERT query
         execute_query(DB_PATH, "INSERT INTO users VALUES (?, ?)", (1, 'admin'), commit=True)
     """
-    with get_db_connection(db_path, timeout=timeout, row_factory=row_factory) as conn:
+    writer = _writer_lock(db_path) if commit else nullcontext()
+    with writer, get_db_connection(db_path, timeout=timeout, row_factory=row_factory) as conn:
         cursor = conn.cursor()
         if params:
             cursor.execute(query, params)
         else:
             cursor.execute(query)
 
+        if fetch is None:
+            # Only statements that return rows have a description
+            fetch = cursor.description is not None
+        rows = cursor.fetchall() if fetch else None
+
         if commit:
             conn.commit()
 
-        # Return results for SELECT queries
-        if query.strip().upper().startswith('SELECT'):
-            return cursor.fetchall()
-
-        return None
+        return rows
 
 
 def execute_many(db_path, query, params_list, timeout=10.0):
     """
     Execute multiple queries with the same statement (batch insert/update).
+    The whole batch runs in one BEGIN IMMEDIATE transaction.
 
     Args:
         db_path: Path to SQLite database file
@@ -106,15 +300,32 @@ def execute_many(db_path, query, params_list, timeout=10.0):
         execute_many(DB_PATH, "INSERT INTO users VALUES (?, ?)",
                     [(1, 'admin'), (2, 'user')])
     """
-    with get_db_connection(db_path, timeout=timeout) as conn:
+    with _writer_lock(db_path), get_db_connection(db_path, timeout=timeout) as conn:
+        conn.isolation_level = None
         cursor = conn.cursor()
-        cursor.executemany(query, params_list)
-        conn.commit()
+        with immediate_transaction(conn):
+            cursor.executemany(query, params_list)
+
+
+def execute(db_path, query, params=None, timeout=10.0):
+    """
+    Execute a single write statement and commit it.
+
+    Args:
+        db_path: Path to SQLite database file
+        query: SQL query string
+        params: Query parameters (tuple or dict)
+        timeout: Connection timeout in seconds
+
+    Example:
+        execute(DB_PATH, "UPDATE users SET name = ? WHERE id = ?", ('admin', 1))
+    """
+    execute_query(db_path, query, params, commit=True, timeout=timeout, fetch=False)
 
 
 def execute_transaction(db_path, transaction_func, timeout=10.0):
     """
-    Execute multiple operations in a single transaction.
+    Execute multiple operations in a single BEGIN IMMEDIATE transaction.
     Automatically commits on success, rolls back on error.
 
     Args:
@@ -133,10 +344,11 @@ def execute_transaction(db_path, transaction_func, timeout=10.0):
 
         user_id = execute_transaction(DB_PATH, my_transaction)
     """
-    with get_db_connection(db_path, timeout=timeout) as conn:
+    with _writer_lock(db_path), get_db_connection(db_path, timeout=timeout) as conn:
+        conn.isolation_level = None
         cursor = conn.cursor()
-        result = transaction_func(conn, cursor)
-        conn.commit()
+        with immediate_transaction(conn):
+            result = transaction_func(conn, cursor)
         return result
 
 
@@ -154,7 +366,8 @@ def fetch_one(db_path, query, params=None, row_factory=None, timeout=10.0):
     Returns:
         Single row or None if no results
     """
-    with get_db_connection(db_path, timeout=timeout, row_factory=row_factory) as conn:
+    with get_db_connection(db_path, timeout=timeout, row_factory=row_factory,
+                           readonly=True) as conn:
         cursor = conn.cursor()
         if params:
             cursor.execute(query, params)
@@ -177,7 +390,8 @@ def fetch_all(db_path, query, params=None, row_factory=None, timeout=10.0):
     Returns:
         List of rows
     """
-    with get_db_connection(db_path, timeout=timeout, row_factory=row_factory) as conn:
+    with get_db_connection(db_path, timeout=timeout, row_factory=row_factory,
+                           readonly=True) as conn:
         cursor = conn.cursor()
         if params:
             cursor.execute(query, params)
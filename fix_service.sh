@@ -36,7 +36,7 @@ User=$CURRENT_USER
 Group=$CURRENT_USER
 WorkingDirectory=/home/$CURRENT_USER/audio-recorder
 Environment="PATH=/usr/local/bin:/usr/bin:/bin"
-ExecStart=/usr/bin/python3 /home/$CURRENT_USER/audio-recorder/app.py
+ExecStart=/usr/bin/python3 -m gunicorn -c /home/$CURRENT_USER/audio-recorder/gunicorn.conf.py app:app
 
 # Restart policy
 Restart=always
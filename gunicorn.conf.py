@@ -0,0 +1,32 @@
+"""
+Gunicorn Configuration
+Serves the Flask app with cooperative (gevent) workers so slow I/O -
+subprocess calls, SQLite, large file downloads - does not tie up the server
+"""
+
+bind = '0.0.0.0:5000'
+
+# A single worker process: APScheduler and the recorder/video process
+# trackers live in module globals, so a second worker would schedule every
+# job twice and lose track of in-progress recordings.
+workers = 1
+
+# The gevent worker monkey-patches the standard library before app.py is
+# imported, so blocking calls yield to other requests instead of holding
+# a thread.
+worker_class = 'gevent'
+worker_connections = 1000
+
+# Long downloads and batch zips must not be mistaken for a hung worker
+timeout = 120
+graceful_timeout = 30
+
+# Keep output going to the systemd-managed app/error logs
+accesslog = '-'
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    """Warm the recordings listing once the worker has loaded the app"""
+    import app
+    app.start_listing_warmup()
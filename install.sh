@@ -208,7 +208,7 @@ User=$CURRENT_USER
 Group=$CURRENT_USER
 WorkingDirectory=$CURRENT_HOME/audio-recorder
 Environment="PATH=/usr/local/bin:/usr/bin:/bin"
-ExecStart=/usr/bin/python3 $CURRENT_HOME/audio-recorder/app.py
+ExecStart=/usr/bin/python3 -m gunicorn -c $CURRENT_HOME/audio-recorder/gunicorn.conf.py app:app
 
 # Restart policy
 Restart=always
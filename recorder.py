@@ -5,13 +5,17 @@ Handles dual-mono capture via FFmpeg
 """
 
 import subprocess
-import signal
-import shutil
+import re
+import select
 import sqlite3
 import sys
 import os
 import logging
+import logging.handlers
+import queue
+import atexit
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import threading
 import time
@@ -23,6 +27,7 @@ LOG_DIR = Path.home() / '.audio-recorder'
 LOG_DIR.mkdir(exist_ok=True)
 RECORDER_LOG_PATH = LOG_DIR / 'recorder.log'
 FFMPEG_LOG_PATH = LOG_DIR / 'ffmpeg.log'
+FFMPEG_LOG_CHUNK = 64 * 1024  # bytes moved per splice/read of ffmpeg stderr
 
 # Configure logging for device detection troubleshooting
 # Use local time for timestamps (not UTC)
@@ -42,6 +47,25 @@ logging.basicConfig(
 for handler in logging.root.handlers:
     handler.setFormatter(LocalTimeFormatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s',
                                             datefmt='%Y-%m-%d %H:%M:%S'))
+
+# Hand records to a background thread that formats and writes them, so
+# logging in the monitor/heartbeat paths is an enqueue instead of two writes
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *logging.root.handlers, respect_handler_level=True)
+logging.root.handlers = [logging.handlers.QueueHandler(_log_queue)]
+_log_listener.start()
+
+
+def _stop_log_listener():
+    """Flush queued records and hand the handlers back to the root logger"""
+    _log_listener.stop()
+    # Late records (and the handlers' lifetime) then match plain logging
+    logging.root.handlers = list(_log_listener.handlers)
+
+
+atexit.register(_stop_log_listener)
+
 logger = logging.getLogger('recorder')
 
 
@@ -54,12 +78,14 @@ def get_log_paths():
     }
 
 
-def _log_system_state():
+def _log_system_state(now=None):
     """Log system state for troubleshooting - called at recording start"""
+    if now is None:
+        now = datetime.now()
     logger.info("=" * 40)
     logger.info("SYSTEM STATE SNAPSHOT")
     logger.info("=" * 40)
-    logger.info(f"Timestamp: {datetime.now().isoformat()}")
+    logger.info(f"Timestamp: {now.isoformat()}")
     logger.info(f"Thread: {threading.current_thread().name}")
 
     # Log environment variables relevant to audio
@@ -69,9 +95,18 @@ def _log_system_state():
         value = os.environ.get(var, '(not set)')
         logger.info(f"  {var}={value}")
 
+    # Run the mixer and process probes concurrently so their fork/exec and
+    # runtime overlap; errors surface from result() below
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        amixer_future = executor.submit(
+            subprocess.run, ['amixer', '-c', '1'], capture_output=True, text=True, timeout=5)
+        pgrep_future = executor.submit(
+            subprocess.run, ['pgrep', '-a', 'ffmpeg|arecord|pulseaudio|pipewire'],
+            capture_output=True, text=True, timeout=5)
+
     # Log ALSA mixer state
     try:
-        result = subprocess.run(['amixer', '-c', '1'], capture_output=True, text=True, timeout=5)
+        result = amixer_future.result()
         if result.returncode == 0:
             logger.info("ALSA mixer state (card 1):")
             for line in result.stdout.split('\n')[:20]:  # First 20 lines
@@ -84,8 +119,7 @@ def _log_system_state():
 
     # Log running audio processes
     try:
-        result = subprocess.run(['pgrep', '-a', 'ffmpeg|arecord|pulseaudio|pipewire'],
-                              capture_output=True, text=True, shell=False, timeout=5)
+        result = pgrep_future.result()
         # pgrep returns non-zero if no matches, that's OK
         if result.stdout.strip():
             logger.info("Running audio-related processes:")
@@ -99,28 +133,66 @@ def _log_system_state():
     logger.info("=" * 40)
 
 
+def _copy_stream(src_fd, dst_fd):
+    """
+    Copy src_fd to dst_fd until EOF. Uses splice() so the bytes never pass
+    through Python, falling back to read/write where it isn't supported.
+    src_fd may be non-blocking (gevent makes subprocess pipes so); when it
+    has nothing buffered, wait in select() until it's readable again.
+    """
+    splice = getattr(os, 'splice', None)
+    while True:
+        try:
+            if splice is not None:
+                try:
+                    copied = splice(src_fd, dst_fd, FFMPEG_LOG_CHUNK)
+                except BlockingIOError:
+                    raise
+                except OSError:
+                    splice = None  # e.g. target filesystem can't splice
+                    continue
+            else:
+                data = os.read(src_fd, FFMPEG_LOG_CHUNK)
+                copied = len(data)
+                if copied:
+                    os.write(dst_fd, data)
+        except BlockingIOError:
+            select.select([src_fd], [], [])
+            continue
+        if not copied:
+            return
+
+
 def _log_ffmpeg_output(process, paths, job_timestamp):
-    """Log FFmpeg stderr to dedicated log file"""
-    ffmpeg_log_file = FFMPEG_LOG_PATH
+    """Copy FFmpeg stderr to the dedicated log file (timestamps on header/footer only)"""
+    try:
+        # Not O_APPEND: splice() refuses append-mode targets
+        log_fd = os.open(FFMPEG_LOG_PATH, os.O_WRONLY | os.O_CREAT, 0o644)
+    except OSError as e:
+        logger.error(f"Error opening FFmpeg log: {e}")
+        # Still drain the pipe so ffmpeg never blocks on a full buffer
+        log_fd = os.open(os.devnull, os.O_WRONLY)
 
     try:
-        with open(ffmpeg_log_file, 'a') as f:
-            f.write(f"\n{'='*60}\n")
-            f.write(f"Recording: {job_timestamp}\n")
-            f.write(f"Started: {datetime.now().isoformat()}\n")
-            f.write(f"Output files: {paths['source_a']}, {paths['source_b']}\n")
-            f.write(f"{'='*60}\n")
-
-            # Read stderr in real-time
-            for line in process.stderr:
-                timestamp = datetime.now().strftime('%H:%M:%S')
-                f.write(f"[{timestamp}] {line}")
-                f.flush()
-
-            f.write(f"\nProcess ended: {datetime.now().isoformat()}\n")
-            f.write(f"Return code: {process.returncode}\n")
+        os.lseek(log_fd, 0, os.SEEK_END)
+        os.write(log_fd, (
+            f"\n{'='*60}\n"
+            f"Recording: {job_timestamp}\n"
+            f"Started: {datetime.now().isoformat()}\n"
+            f"Output files: {paths['source_a']}, {paths['source_b']}\n"
+            f"{'='*60}\n"
+        ).encode())
+
+        _copy_stream(process.stderr.fileno(), log_fd)
+
+        os.write(log_fd, (
+            f"\nProcess ended: {datetime.now().isoformat()}\n"
+            f"Return code: {process.wait()}\n"
+        ).encode())
     except Exception as e:
         logger.error(f"Error writing FFmpeg log: {e}")
+    finally:
+        os.close(log_fd)
 
 # Configuration constants
 DEFAULT_MAX_DURATION = 14400  # 4 hours in seconds
@@ -130,39 +202,58 @@ CHANNELS = 2  # Stereo (split into 2 mono files)
 SAFETY_MARGIN = 1.1  # 10% overhead for filesystem
 DISK_SPACE_MULTIPLIER = 2  # Require 2x estimated size
 
-# Global process tracker
+# Estimated bytes written per second of recording (both channels, with
+# margin), and the free space required per second by the preflight check
+BYTES_PER_SECOND = int(SAMPLE_RATE * BYTES_PER_SAMPLE * CHANNELS * SAFETY_MARGIN)
+REQUIRED_BYTES_PER_SECOND = BYTES_PER_SECOND * DISK_SPACE_MULTIPLIER
+
+# Global process tracker. process_lock serializes writers (start/stop);
+# _recording_event lets is_recording() skip the waitpid when idle.
 current_process = None
 process_lock = threading.Lock()
+_recording_event = threading.Event()
 
+# Short-lived cache of `arecord -l` results (devices rarely change mid-session)
+DEVICE_CACHE_TTL = 30  # seconds; the settings page invalidates on demand
+ARECORD_LIST_TIMEOUT = 1.0  # seconds; arecord -l only queries ALSA card info
 
-def load_channel_suffixes():
-    """Load channel suffix configuration from database"""
-    try:
-        from pathlib import Path as PPath
-        db_path = PPath.home() / '.audio-recorder' / 'schedule.db'
+# arecord -l device line, e.g.
+# card 1: CODEC [USB Audio CODEC], device 0: USB Audio [USB Audio]
+_ARECORD_DEVICE_RE = re.compile(r'card (\d+): (\w+) \[([^\]]+)\], device (\d+): ([^\[]+)')
+# Card names that identify the Behringer UCA202 (recommended device)
+_UCA202_NAME_TOKENS = ('USB Audio', 'PCM290', 'CODEC')
+_devices_cache = {'timestamp': 0.0, 'devices': None}
+_devices_lock = threading.Lock()  # one arecord -l at a time; others reuse its result
 
-        if not db_path.exists():
-            return 'L', 'R'  # Defaults if DB doesn't exist yet
+# Short-lived cache of free space per recordings directory
+DISK_USAGE_TTL = 2  # seconds
+_disk_free_cache = {}  # str(path) -> (timestamp, free_bytes)
 
-        left_row = db_utils.fetch_one(db_path,
-            "SELECT value FROM system_config WHERE key = 'channel_left_suffix'")
-        left_suffix = left_row[0] if left_row else 'L'
 
-        right_row = db_utils.fetch_one(db_path,
-            "SELECT value FROM system_config WHERE key = 'channel_right_suffix'")
-        right_suffix = right_row[0] if right_row else 'R'
+def load_channel_suffixes():
+    """Load channel suffix configuration (cached by scheduler.get_system_configs)"""
+    try:
+        values = scheduler.get_system_configs(('channel_left_suffix', 'channel_right_suffix'))
+    except (sqlite3.Error, OSError) as e:
+        # Fall back to defaults if the config DB is unavailable
+        logger.warning("Channel suffix load failed, using L/R: %s", e)
+        return 'L', 'R'
+    return values['channel_left_suffix'] or 'L', values['channel_right_suffix'] or 'R'
 
-        return left_suffix, right_suffix
-    except:
-        return 'L', 'R'  # Fallback to defaults on any error
 
+def get_recording_path(now=None):
+    """
+    Generate timestamped recording filenames with configured suffixes
 
-def get_recording_path():
-    """Generate timestamped recording filenames with configured suffixes"""
-    now = datetime.now()
+    Args:
+        now: Recording start time (default: current time)
+    """
+    if now is None:
+        now = datetime.now()
 
-    # New format: YYYY_MMM_DD_HH:MM_L.wav
-    timestamp = now.strftime('%Y_%b_%d_%H:%M')
+    # Format: YYYYMMDD_HHMMSS_L.wav - sorts chronologically, no ':' (which
+    # FAT/exFAT and SMB shares reject) and no locale-dependent month name
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
 
     # Get storage path from config
     storage_path = scheduler.get_system_config('storage_path', '/mnt/usb_recorder')
@@ -190,13 +281,8 @@ def calculate_estimated_size(duration_seconds):
     Returns:
         Estimated total size in bytes (both channels)
     """
-    # Size per channel: duration * sample_rate * bytes_per_sample
-    size_per_channel = duration_seconds * SAMPLE_RATE * BYTES_PER_SAMPLE
-    
-    # Total for both channels with safety margin
-    total_size = size_per_channel * CHANNELS * SAFETY_MARGIN
-    
-    return int(total_size)
+    # Both channels with safety margin, precomputed as BYTES_PER_SECOND
+    return int(duration_seconds * BYTES_PER_SECOND)
 
 
 def check_disk_space(duration_seconds, recording_dir):
@@ -211,11 +297,18 @@ def check_disk_space(duration_seconds, recording_dir):
         Tuple of (sufficient: bool, message: str, available_gb: float, required_gb: float)
     """
     estimated_size = calculate_estimated_size(duration_seconds)
-    required_size = estimated_size * DISK_SPACE_MULTIPLIER
+    required_size = int(duration_seconds * REQUIRED_BYTES_PER_SECOND)
     
-    # Check available disk space
-    stat = shutil.disk_usage(recording_dir)
-    available = stat.free
+    # Check available disk space (statvfs at most every DISK_USAGE_TTL seconds)
+    key = str(recording_dir)
+    now = time.monotonic()
+    cached = _disk_free_cache.get(key)
+    if cached is not None and now - cached[0] < DISK_USAGE_TTL:
+        available = cached[1]
+    else:
+        st = os.statvfs(recording_dir)
+        available = st.f_bavail * st.f_frsize
+        _disk_free_cache[key] = (now, available)
     
     available_gb = available / (1024**3)
     required_gb = required_size / (1024**3)
@@ -276,6 +369,9 @@ def start_capture(duration_seconds=3600, device=None, allow_override=False):
         logger.info(f"Device config from database: '{device_config}'")
         if device_config == 'auto':
             logger.info("Auto-detecting audio device...")
+            # Recordings must see the device that is plugged in now, not a
+            # listing cached for the settings page
+            invalidate_device_cache()
             device = auto_detect_audio_device()
         else:
             device = device_config
@@ -283,57 +379,74 @@ def start_capture(duration_seconds=3600, device=None, allow_override=False):
 
     logger.info(f"FINAL DEVICE FOR RECORDING: {device}")
     
+    # Everything up to the spawn runs without process_lock, so is_recording()
+    # callers aren't held up by the disk check and diagnostics. Fail fast
+    # here; the authoritative check is repeated under the lock below.
+    if is_recording():
+        raise RuntimeError("Recording already in progress")
+
+    # Validate duration
+    valid, msg = validate_duration(duration_seconds, allow_override)
+    if not valid:
+        raise RuntimeError(msg)
+    
+    # One clock read names the files and stamps the startup log
+    now = datetime.now()
+    paths = get_recording_path(now)
+    
+    # Check disk space
+    sufficient, msg, avail_gb, req_gb = check_disk_space(duration_seconds, paths['directory'])
+    if not sufficient:
+        raise RuntimeError(msg)
+    
+    logger.info(f"Starting recording: {duration_seconds}s on {device}, ~{req_gb/2:.2f} GB estimated per channel")
+    print(f"Starting recording: {duration_seconds}s on {device}, ~{req_gb/2:.2f} GB estimated per channel")
+
+    # Log system state for troubleshooting
+    _log_system_state(now)
+
+    # FFmpeg command for dual-mono capture
+    cmd = [
+        'ffmpeg',
+        '-nostdin',                   # stdin isn't used; stop ffmpeg polling it
+        '-hide_banner',
+        '-loglevel', 'warning',       # keep warnings/errors, drop per-frame stats
+        '-nostats',
+        '-f', 'alsa',
+        '-thread_queue_size', '4096',  # absorb scheduling hiccups on the Pi
+        '-i', device,
+        '-t', str(duration_seconds),
+        '-filter_complex', '[0:a]channelsplit=channel_layout=stereo[left][right]',
+        '-map', '[left]',
+        '-acodec', 'pcm_s16le',
+        '-ar', str(SAMPLE_RATE),
+        str(paths['source_a']),
+        '-map', '[right]',
+        '-acodec', 'pcm_s16le',
+        '-ar', str(SAMPLE_RATE),
+        str(paths['source_b'])
+    ]
+
+    # Log the exact FFmpeg command for reproduction/debugging
+    cmd_str = ' '.join(str(c) for c in cmd)
+    logger.info(f"FFmpeg command: {cmd_str}")
+
     with process_lock:
         if current_process and current_process.poll() is None:
             raise RuntimeError("Recording already in progress")
-        
-        # Validate duration
-        valid, msg = validate_duration(duration_seconds, allow_override)
-        if not valid:
-            raise RuntimeError(msg)
-        
-        paths = get_recording_path()
-        
-        # Check disk space
-        sufficient, msg, avail_gb, req_gb = check_disk_space(duration_seconds, paths['directory'])
-        if not sufficient:
-            raise RuntimeError(msg)
-        
-        logger.info(f"Starting recording: {duration_seconds}s on {device}, ~{req_gb/2:.2f} GB estimated per channel")
-        print(f"Starting recording: {duration_seconds}s on {device}, ~{req_gb/2:.2f} GB estimated per channel")
-
-        # Log system state for troubleshooting
-        _log_system_state()
-
-        # FFmpeg command for dual-mono capture
-        cmd = [
-            'ffmpeg',
-            '-f', 'alsa',
-            '-i', device,
-            '-t', str(duration_seconds),
-            '-filter_complex', '[0:a]channelsplit=channel_layout=stereo[left][right]',
-            '-map', '[left]',
-            '-acodec', 'pcm_s16le',
-            '-ar', str(SAMPLE_RATE),
-            str(paths['source_a']),
-            '-map', '[right]',
-            '-acodec', 'pcm_s16le',
-            '-ar', str(SAMPLE_RATE),
-            str(paths['source_b'])
-        ]
-
-        # Log the exact FFmpeg command for reproduction/debugging
-        cmd_str = ' '.join(str(c) for c in cmd)
-        logger.info(f"FFmpeg command: {cmd_str}")
 
         # Start FFmpeg process
+        # stderr is copied as raw bytes into the ffmpeg log by
+        # _log_ffmpeg_output; stdout is never read, so don't pipe it
         current_process = subprocess.Popen(
             cmd,
-            stdout=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
-            preexec_fn=lambda: signal.signal(signal.SIGINT, signal.SIG_IGN),
-            text=True  # Enable text mode for easier log reading
+            # Own session keeps terminal SIGINTs away from ffmpeg; unlike a
+            # preexec_fn it doesn't force subprocess onto the slow fork path
+            start_new_session=True
         )
+        _recording_event.set()
         
         # Start monitoring thread
         monitor_thread = threading.Thread(
@@ -353,9 +466,13 @@ def is_recording():
     Returns:
         bool: True if recording is active, False otherwise
     """
-    global current_process
-    with process_lock:
-        return current_process is not None and current_process.poll() is None
+    # Lock-free: the event is cleared as soon as ffmpeg exits, so idle
+    # checks are a flag read. While it's set, read the tracker once
+    # (stop_capture may clear it concurrently) and confirm with poll().
+    if not _recording_event.is_set():
+        return False
+    process = current_process
+    return process is not None and process.poll() is None
 
 
 def stop_capture():
@@ -380,6 +497,7 @@ def stop_capture():
             current_process.wait()
 
         current_process = None
+        _recording_event.clear()
 
     # Check for unanalyzed files in background
     threading.Thread(
@@ -388,6 +506,30 @@ def stop_capture():
     ).start()
 
 
+def _wait_for_exit(process, pidfd, timeout):
+    """
+    Block until the process exits or timeout seconds pass.
+    Returns True if the process has exited.
+    """
+    timeout = max(0, timeout)
+    if pidfd is not None:
+        # A pidfd becomes readable when the process exits
+        select.select([pidfd], [], [], timeout)
+    else:
+        end = time.monotonic() + timeout
+        while process.poll() is None and time.monotonic() < end:
+            time.sleep(min(5, max(0, end - time.monotonic())))
+    return process.poll() is not None
+
+
+def _file_size(path):
+    """Size of a file in bytes, or None if it doesn't exist"""
+    try:
+        return os.stat(path, follow_symlinks=False).st_size
+    except FileNotFoundError:
+        return None
+
+
 def _monitor_process(process, paths, duration):
     """
     Monitor FFmpeg process and handle post-processing
@@ -403,32 +545,42 @@ def _monitor_process(process, paths, duration):
     )
     ffmpeg_log_thread.start()
 
-    # Heartbeat logging - log every 60 seconds while recording
+    # Heartbeat logging - log every 60 seconds while recording. Between
+    # heartbeats the thread sleeps until ffmpeg exits instead of polling.
     heartbeat_interval = 60
-    start_time = time.time()
-    heartbeat_count = 0
-
-    while process.poll() is None:
-        time.sleep(5)  # Check every 5 seconds
-        elapsed = time.time() - start_time
-
-        # Log heartbeat every 60 seconds
-        if elapsed >= (heartbeat_count + 1) * heartbeat_interval:
-            heartbeat_count += 1
-            minutes_elapsed = int(elapsed / 60)
-            minutes_remaining = int((duration - elapsed) / 60)
-            logger.info(f"HEARTBEAT [{job_timestamp}]: Recording in progress - "
-                       f"{minutes_elapsed} min elapsed, ~{minutes_remaining} min remaining")
-
-    # Process completed
-    elapsed_total = time.time() - start_time
+    start_time = time.monotonic()
+    deadline = start_time + heartbeat_interval
+
+    try:
+        pidfd = os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        pidfd = None  # Pre-5.3 kernel or non-Linux: fall back to polling
+
+    # Fixed per recording; logging fills in (and truncates) the two counters
+    heartbeat_format = (f"HEARTBEAT [{job_timestamp}]: Recording in progress - "
+                        "%d min elapsed, ~%d min remaining")
+
+    try:
+        while not _wait_for_exit(process, pidfd, deadline - time.monotonic()):
+            elapsed = time.monotonic() - start_time
+            logger.info(heartbeat_format, elapsed / 60, (duration - elapsed) / 60)
+            deadline += heartbeat_interval
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+    # Process completed; a newer recording may already own the tracker
+    with process_lock:
+        if current_process is process:
+            _recording_event.clear()
+    elapsed_total = time.monotonic() - start_time
     logger.info(f"FFmpeg process ended for {job_timestamp} after {elapsed_total:.1f}s (expected {duration}s)")
     logger.info(f"FFmpeg return code: {process.returncode}")
 
-    # Check if files were created successfully
-    if paths['source_a'].exists() and paths['source_b'].exists():
-        size_a = paths['source_a'].stat().st_size
-        size_b = paths['source_b'].stat().st_size
+    # Check if files were created successfully (one stat per file)
+    size_a = _file_size(paths['source_a'])
+    size_b = _file_size(paths['source_b'])
+    if size_a is not None and size_b is not None:
         size_a_mb = size_a / (1024 * 1024)
         size_b_mb = size_b / (1024 * 1024)
 
@@ -457,6 +609,25 @@ def _monitor_process(process, paths, duration):
         print(f"Recording failed: {paths['timestamp']}")
 
 
+def _drop_page_cache(filepath):
+    """
+    Tell the kernel a finished recording's pages won't be needed again, so
+    hours of PCM don't push more useful data out of the page cache
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError as e:
+        logger.debug(f"posix_fadvise failed for {filepath}: {e}")
+    finally:
+        os.close(fd)
+
+
 def _analyze_recording_delayed(source_a, source_b, job_timestamp):
     """
     Analyze recording files and store results in database.
@@ -468,7 +639,6 @@ def _analyze_recording_delayed(source_a, source_b, job_timestamp):
         job_timestamp: Recording timestamp identifier
     """
     import audio_analyzer
-    import db_utils
     from datetime import datetime
 
     logger.info(f"Starting analysis for recording: {job_timestamp}")
@@ -532,9 +702,11 @@ def _analyze_recording_delayed(source_a, source_b, job_timestamp):
             except:
                 pass
 
-    # Analyze both channels
-    analyze_and_store(source_a, 'left')
-    analyze_and_store(source_b, 'right')
+    # Analyze both channels; analysis is the last read of each file, so
+    # release its cached pages afterwards
+    for filepath, channel_name in ((source_a, 'left'), (source_b, 'right')):
+        analyze_and_store(filepath, channel_name)
+        _drop_page_cache(filepath)
 
     logger.info(f"Analysis batch complete for: {job_timestamp}")
 
@@ -546,7 +718,6 @@ def analyze_unanalyzed_recordings():
     """
     from pathlib import Path
     from scheduler import get_system_config, DB_PATH
-    import db_utils
 
     storage_path = get_system_config('storage_path', '/mnt/usb_recorder')
     recordings_dir = Path(storage_path)
@@ -592,12 +763,6 @@ def analyze_unanalyzed_recordings():
                 ).start()
 
 
-def is_recording():
-    """Check if a recording is currently in progress"""
-    global current_process
-    return current_process is not None and current_process.poll() is None
-
-
 def get_available_devices():
     """
     List available ALSA audio devices
@@ -620,38 +785,60 @@ def get_available_devices():
 
 def get_available_audio_devices():
     """
-    Parse arecord -l output to list all capture-capable devices
+    List all capture-capable devices, reusing a recent enumeration
 
     Returns list of dictionaries with device info
     """
-    import re
+    with _devices_lock:
+        now = time.monotonic()
+        if (_devices_cache['devices'] is not None
+                and now - _devices_cache['timestamp'] < DEVICE_CACHE_TTL):
+            return list(_devices_cache['devices'])
+
+        devices = _enumerate_audio_devices()
+        # An empty list usually means arecord -l failed or timed out; don't
+        # let that stick for the whole TTL
+        if devices:
+            _devices_cache['devices'] = devices
+            _devices_cache['timestamp'] = time.monotonic()
+        return list(devices)
+
 
+def invalidate_device_cache():
+    """Force the next device lookup to re-run arecord -l"""
+    _devices_cache['devices'] = None
+
+
+def _enumerate_audio_devices():
+    """
+    Parse arecord -l output to list all capture-capable devices
+
+    Returns list of dictionaries with device info
+    """
     logger.debug(f"get_available_audio_devices() called from thread: {threading.current_thread().name}")
 
     try:
-        result = subprocess.run(['arecord', '-l'], capture_output=True, text=True)
+        result = subprocess.run(['arecord', '-l'], capture_output=True, text=True,
+                                timeout=ARECORD_LIST_TIMEOUT)
         logger.debug(f"arecord -l return code: {result.returncode}")
         logger.debug(f"arecord -l stdout: {result.stdout[:500] if result.stdout else '(empty)'}")
         if result.stderr:
             logger.debug(f"arecord -l stderr: {result.stderr[:500]}")
-    except Exception as e:
+    except (OSError, subprocess.SubprocessError) as e:
         logger.error(f"arecord -l failed with exception: {e}")
         return []
     
     devices = []
+    # A Burr-Brown chip anywhere in the listing marks every device as the UCA202
+    burr_brown = 'Burr-Brown' in result.stdout
     
-    # Parse output format:
-    # card 1: CODEC [USB Audio CODEC], device 0: USB Audio [USB Audio]
-    pattern = r'card (\d+): (\w+) \[([^\]]+)\], device (\d+): ([^\[]+)'
-    
-    for match in re.finditer(pattern, result.stdout):
+    for match in _ARECORD_DEVICE_RE.finditer(result.stdout):
         card, short_name, full_name, device, desc = match.groups()
         
         alsa_id = f"hw:{card},{device}"
         
         # Detect UCA202 specifically
-        is_uca202 = ('USB Audio' in full_name or 'PCM290' in full_name or 
-                     'CODEC' in full_name or 'Burr-Brown' in result.stdout)
+        is_uca202 = burr_brown or any(token in full_name for token in _UCA202_NAME_TOKENS)
         
         devices.append({
             'card': int(card),
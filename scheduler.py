@@ -8,6 +8,8 @@ import sqlite3
 import sys
 import os
 import logging
+import logging.handlers
+import threading
 import traceback
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -41,8 +43,11 @@ logging.basicConfig(
         logging.FileHandler(SCHEDULER_LOG_PATH)
     ]
 )
-# Apply local time formatter to all handlers
+# Apply local time formatter to all handlers (recorder may already have put
+# them behind a queue; its QueueHandler must keep the plain formatter)
 for handler in logging.root.handlers:
+    if isinstance(handler, logging.handlers.QueueHandler):
+        continue
     handler.setFormatter(LocalTimeFormatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s',
                                             datefmt='%Y-%m-%d %H:%M:%S'))
 logger = logging.getLogger('scheduler')
@@ -488,6 +493,7 @@ def create_job(start_time, duration, name='Unnamed Recording', notes='',
     ''', (job_id, name, start_time, duration, datetime.now().isoformat(),
           notes, 1 if is_recurring else 0, recurrence_pattern, template_id,
           1 if allow_override else 0, 1 if capture_video else 0), commit=True)
+    invalidate_jobs_cache()
 
     # Schedule with APScheduler
     if is_recurring and recurrence_pattern:
@@ -562,6 +568,7 @@ def delete_job(job_id):
     db_utils.execute_query(DB_PATH,
         'DELETE FROM scheduled_jobs WHERE id = ?',
         (job_id,), commit=True)
+    invalidate_jobs_cache()
 
 
 def cleanup_old_records(months_old, include_completed=True, include_failed=True,
@@ -644,6 +651,7 @@ def cleanup_old_records(months_old, include_completed=True, include_failed=True,
 
     try:
         db_utils.execute_transaction(DB_PATH, _cleanup_transaction)
+        invalidate_jobs_cache()
 
         return {
             'success': True,
@@ -783,6 +791,7 @@ def update_job(job_id, start_time=None, duration=None, name=None, notes=None,
     ''', (new_start_time, new_duration, new_name, new_notes,
           1 if new_is_recurring else 0, new_recurrence_pattern,
           1 if new_allow_override else 0, 1 if new_capture_video else 0, job_id), commit=True)
+    invalidate_jobs_cache()
 
     # Remove old scheduler job
     try:
@@ -810,6 +819,12 @@ def update_job(job_id, start_time=None, duration=None, name=None, notes=None,
     return True
 
 
+# In-process cache of get_all_jobs() results.
+# Invalidated by every write to scheduled_jobs.
+_jobs_cache = {'valid': False, 'data': None}
+_jobs_cache_lock = threading.Lock()
+
+
 def get_all_jobs():
     """
     Retrieve all scheduled jobs
@@ -817,12 +832,63 @@ def get_all_jobs():
     Returns:
         List of job dictionaries
     """
-    rows = db_utils.fetch_all(DB_PATH, '''
-        SELECT * FROM scheduled_jobs
-        ORDER BY start_time DESC
-    ''', row_factory=sqlite3.Row)
+    if not _jobs_cache['valid']:
+        with _jobs_cache_lock:
+            if not _jobs_cache['valid']:
+                rows = db_utils.fetch_all(DB_PATH, '''
+                    SELECT * FROM scheduled_jobs
+                    ORDER BY start_time DESC
+                ''', row_factory=sqlite3.Row)
+                _jobs_cache['data'] = [dict(row) for row in rows]
+                _jobs_cache['valid'] = True
+
+    return list(_jobs_cache['data'])
 
-    return [dict(row) for row in rows]
+
+def invalidate_jobs_cache():
+    """
+    Mark the cached job list (and the disk projection built from it) as stale.
+    Call after writing scheduled_jobs outside this module.
+    """
+    with _jobs_cache_lock:
+        _jobs_cache['valid'] = False
+        _projection_cache['value'] = None
+
+
+# Pending-job summary for the disk space projection, built from get_all_jobs()
+# and dropped together with the job cache
+_projection_cache = {'value': None}
+
+
+def get_scheduled_projection():
+    """
+    Summarize pending jobs for disk projections.
+
+    Returns:
+        (recurring_hours, one_time) where one_time is a list of
+        (start datetime, duration hours) for pending one-time jobs
+    """
+    projection = _projection_cache['value']
+    if projection is None:
+        recurring_hours = 0
+        one_time = []
+        for job in get_all_jobs():
+            if job.get('status') == 'pending':
+                duration_hours = job.get('duration', 0) / 3600
+
+                if job.get('is_recurring'):
+                    # For recurring jobs, estimate next 7 days worth
+                    recurring_hours += duration_hours * 7
+                else:
+                    job_time = datetime.fromisoformat(job.get('start_time', ''))
+                    one_time.append((job_time, duration_hours))
+
+        projection = (recurring_hours, one_time)
+        with _jobs_cache_lock:
+            # Only keep it if no write invalidated the jobs meanwhile
+            if _jobs_cache['valid']:
+                _projection_cache['value'] = projection
+    return projection
 
 
 def get_pending_jobs():
@@ -894,6 +960,7 @@ def _execute_scheduled_recording(job_id, duration, allow_override=False, capture
                 SET status = 'completed', completed_at = ?, notes = COALESCE(notes || ' ', '') || ?
                 WHERE id = ?
             ''', (datetime.now().isoformat(), status_note, job_id), commit=True)
+            invalidate_jobs_cache()
             logger.info(f"Job {job_id} marked as completed (one-time job)")
         else:
             # For recurring jobs, create an instance record for this occurrence
@@ -931,6 +998,7 @@ def _execute_scheduled_recording(job_id, duration, allow_override=False, capture
                 SET status = 'failed', completed_at = ?, notes = ?
                 WHERE id = ?
             ''', (datetime.now().isoformat(), str(e), job_id), commit=True)
+            invalidate_jobs_cache()
             logger.info(f"Job {job_id} marked as failed (one-time job)")
         else:
             # For recurring jobs, create a failed instance record
@@ -955,6 +1023,9 @@ def restore_jobs_on_startup():
     Restore pending jobs from database after system restart
     Should be called when the application starts
     """
+    # The table may have been replaced (import/revert) or statuses changed below
+    invalidate_jobs_cache()
+
     jobs = get_pending_jobs()
 
     for job in jobs:
@@ -993,15 +1064,76 @@ def restore_jobs_on_startup():
                 SET status = 'missed'
                 WHERE id = ?
             ''', (job['id'],), commit=True)
+            invalidate_jobs_cache()
             print(f"Marked job as missed: {job['id']}")
 
 
+# In-process cache of system_config values (None marks a missing key).
+# Entries are dropped whenever this process writes the row, and expire
+# after CONFIG_CACHE_TTL so writes from other processes (e.g. the
+# troubleshooting script's set_system_config) are picked up.
+CONFIG_CACHE_TTL = 5.0  # seconds
+_config_cache = {}
+_config_cache_lock = threading.Lock()
+
+
+def _cached_config(key):
+    """Return a cached (value,) for key, or None if absent or expired"""
+    entry = _config_cache.get(key)
+    if entry is None or time_module.monotonic() - entry[1] >= CONFIG_CACHE_TTL:
+        return None
+    return (entry[0],)
+
+
 def get_system_config(key, default=None):
     """Get system configuration value"""
-    row = db_utils.fetch_one(DB_PATH,
-        'SELECT value FROM system_config WHERE key = ?',
-        (key,))
-    return row[0] if row else default
+    cached = _cached_config(key)
+    if cached is not None:
+        value = cached[0]
+    else:
+        with _config_cache_lock:
+            row = db_utils.fetch_one(DB_PATH,
+                'SELECT value FROM system_config WHERE key = ?',
+                (key,))
+            value = row[0] if row else None
+            _config_cache[key] = (value, time_module.monotonic())
+    return value if value is not None else default
+
+
+def get_system_configs(keys):
+    """
+    Get several system configuration values, reading any uncached keys
+    with a single query.
+
+    Args:
+        keys: Iterable of configuration keys
+
+    Returns:
+        Dictionary of key -> value (None for keys that are not set)
+    """
+    keys = list(keys)
+    values = {}
+    missing = []
+    for key in keys:
+        cached = _cached_config(key)
+        if cached is not None:
+            values[key] = cached[0]
+        else:
+            missing.append(key)
+
+    if missing:
+        with _config_cache_lock:
+            placeholders = ','.join('?' * len(missing))
+            rows = db_utils.fetch_all(DB_PATH,
+                f'SELECT key, value FROM system_config WHERE key IN ({placeholders})',
+                missing)
+            found = dict(rows)
+            now = time_module.monotonic()
+            for key in missing:
+                values[key] = found.get(key)
+                _config_cache[key] = (values[key], now)
+
+    return values
 
 
 def set_system_config(key, value):
@@ -1011,6 +1143,41 @@ def set_system_config(key, value):
         VALUES (?, ?, datetime('now'))
     ''', (key, value), commit=True)
 
+    with _config_cache_lock:
+        _config_cache.pop(key, None)
+
+
+def set_system_configs(values):
+    """
+    Set several system configuration values in one transaction.
+
+    Args:
+        values: Dictionary of key -> value
+    """
+    if not values:
+        return
+
+    def _set_all(conn, cursor):
+        cursor.executemany('''
+            INSERT OR REPLACE INTO system_config (key, value, updated_at)
+            VALUES (?, ?, datetime('now'))
+        ''', list(values.items()))
+
+    db_utils.execute_transaction(DB_PATH, _set_all)
+
+    with _config_cache_lock:
+        for key in values:
+            _config_cache.pop(key, None)
+
+
+def invalidate_config_cache():
+    """
+    Drop all cached configuration values.
+    Call after writing system_config without going through set_system_config.
+    """
+    with _config_cache_lock:
+        _config_cache.clear()
+
 
 # Initialize database on module import
 init_database()
@@ -0,0 +1,36 @@
+"""Tests for db_utils write helpers"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db_utils
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'test.db')
+    db_utils.execute_query(path, 'CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)',
+                           commit=True)
+    yield path
+    db_utils.close_all_pools()
+
+
+def test_execute_commits_write(db_path):
+    db_utils.execute(db_path, 'INSERT INTO items (id, name) VALUES (?, ?)', (1, 'a'))
+    db_utils.execute(db_path, 'UPDATE items SET name = ? WHERE id = ?', ('b', 1))
+
+    assert db_utils.fetch_all(db_path, 'SELECT id, name FROM items') == [(1, 'b')]
+
+
+def test_execute_returns_none(db_path):
+    assert db_utils.execute(db_path, 'INSERT INTO items (name) VALUES (?)', ('a',)) is None
+
+
+def test_execute_without_params(db_path):
+    db_utils.execute(db_path, "INSERT INTO items (name) VALUES ('a')")
+
+    assert db_utils.fetch_one(db_path, 'SELECT COUNT(*) FROM items') == (1,)
@@ -0,0 +1,50 @@
+"""Tests for recorder process tracking"""
+
+import inspect
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('apscheduler')
+
+import recorder
+
+
+class _FakeProcess:
+    def __init__(self, returncode=None):
+        self.returncode = returncode
+
+    def poll(self):
+        return self.returncode
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    monkeypatch.setattr(recorder, 'current_process', None)
+    yield recorder._recording_event
+    recorder._recording_event.clear()
+
+
+def test_is_recording_defined_once():
+    source = inspect.getsource(recorder)
+    assert source.count('\ndef is_recording(') == 1
+
+
+def test_is_recording_idle_when_event_clear(tracker, monkeypatch):
+    monkeypatch.setattr(recorder, 'current_process', _FakeProcess())
+    assert recorder.is_recording() is False
+
+
+def test_is_recording_follows_running_process(tracker, monkeypatch):
+    monkeypatch.setattr(recorder, 'current_process', _FakeProcess())
+    tracker.set()
+    assert recorder.is_recording() is True
+
+
+def test_is_recording_false_once_process_exits(tracker, monkeypatch):
+    monkeypatch.setattr(recorder, 'current_process', _FakeProcess(returncode=0))
+    tracker.set()
+    assert recorder.is_recording() is False
@@ -324,6 +324,7 @@ echo
 echo "QUICK FIX - Set explicit device:"
 echo "  cd $SCRIPT_DIR"
 echo "  python3 -c \"import scheduler; scheduler.set_system_config('audio_device', 'hw:1,0')\""
+echo "  (the running service picks this up within a few seconds)"
 echo
 echo "Check logs after next scheduled recording:"
 echo "  tail -f ~/.audio-recorder/recorder.log"
@@ -5,12 +5,13 @@ Handles PTZOptics camera control, RTSP stream recording, and hardware-accelerate
 """
 
 import subprocess
-import signal
 import shutil
 import os
 import re
 import threading
+import time
 import json
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import quote
@@ -26,11 +27,20 @@ DEFAULT_VIDEO_BITRATE = '4M'  # For hardware transcoding
 VIDEO_MB_PER_HOUR = 2000  # Estimated ~2GB/hour for raw RTSP stream at 1080p
 SAFETY_MARGIN = 1.1
 
+# ffmpeg's own log for video recordings (stderr is appended here, not piped)
+VIDEO_FFMPEG_LOG_PATH = Path.home() / '.audio-recorder' / 'video_ffmpeg.log'
+
 # Global process tracker for video recording
 video_process = None
 video_process_lock = threading.Lock()
 current_video_file = None
-video_start_time = None
+video_start_time = None  # Epoch seconds
+
+# Lines of transcode stderr kept for error reporting
+TRANSCODE_STDERR_TAIL = 256
+TRANSCODE_READ_CHUNK = 64 * 1024
+_TRANSCODE_LINE_END = re.compile(rb'[\r\n]')
+_TRANSCODE_TIME_RE = re.compile(rb'time=(\d+):(\d+):(\d+)\.(\d+)')
 
 # Global tracker for transcoding
 transcode_process = None
@@ -76,6 +86,24 @@ def set_camera_config(key, value):
     scheduler.set_system_config(key, value)
 
 
+# Keys stored as JSON and decoded by get_camera_config, whatever their type
+_JSON_CAMERA_KEYS = {'preset_names'}
+
+
+def set_camera_config_bulk(updates):
+    """
+    Save several camera configuration values in a single transaction
+
+    Args:
+        updates: Dictionary of key -> value (preset_names is always
+            JSON-encoded, as set_preset_names does; other dict values are too)
+    """
+    scheduler.set_system_configs({
+        key: json.dumps(value) if key in _JSON_CAMERA_KEYS or isinstance(value, dict) else value
+        for key, value in updates.items()
+    })
+
+
 def get_preset_names():
     """Get preset ID to name mappings"""
     try:
@@ -308,7 +336,8 @@ def get_video_path(storage_path):
         Dictionary with file paths
     """
     now = datetime.now()
-    timestamp = now.strftime('%Y_%b_%d_%H-%M-%S')
+    # Same sortable, ':'-free format as the audio recordings
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
 
     # Create raw directory for unprocessed recordings
     raw_dir = Path(storage_path) / 'raw'
@@ -379,7 +408,7 @@ def start_video_recording(duration_seconds=None):
         rtsp_url = get_rtsp_url()
         paths = get_video_path(storage_path)
         current_video_file = paths['raw_file']
-        video_start_time = datetime.now()
+        video_start_time = time.time()
 
         # Build ffmpeg command
         # Using -c copy for zero CPU re-encoding (stream copy)
@@ -402,13 +431,21 @@ def start_video_recording(duration_seconds=None):
         print(f"Starting video recording: {paths['raw_file']}")
 
         try:
-            video_process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                preexec_fn=lambda: signal.signal(signal.SIGINT, signal.SIG_IGN)
-            )
+            # Nothing reads ffmpeg's stdout/stderr while it records, so an
+            # undrained pipe would fill up and stall a long recording. stdin
+            # stays a pipe for the graceful 'q' stop.
+            VIDEO_FFMPEG_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(VIDEO_FFMPEG_LOG_PATH, 'ab') as ffmpeg_log:
+                ffmpeg_log.write(f"\n=== {datetime.now().isoformat()} "
+                                 f"{paths['raw_file']} ===\n".encode())
+                ffmpeg_log.flush()
+                video_process = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=ffmpeg_log,
+                    start_new_session=True
+                )
 
             # Start monitoring thread
             monitor_thread = threading.Thread(
@@ -495,7 +532,7 @@ def get_video_recording_status():
         return {
             'is_recording': is_recording,
             'current_file': str(current_video_file) if current_video_file else None,
-            'start_time': video_start_time.isoformat() if video_start_time else None
+            'start_time': video_start_time
         }
 
 
@@ -571,22 +608,23 @@ def transcode_video(input_file, output_file, delete_raw=True):
 
         transcode_process = subprocess.Popen(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
         )
 
-        # Monitor progress from stderr in a separate thread
-        if duration:
-            progress_thread = threading.Thread(
-                target=_read_transcode_progress,
-                args=(transcode_process.stderr, duration),
-                daemon=True
-            )
-            progress_thread.start()
+        # Always drain stderr while ffmpeg runs (a full pipe would stall it),
+        # keeping only the last lines for error reporting
+        stderr_tail = deque(maxlen=TRANSCODE_STDERR_TAIL)
+        progress_thread = threading.Thread(
+            target=_read_transcode_progress,
+            args=(transcode_process.stderr, duration, stderr_tail),
+            daemon=True
+        )
+        progress_thread.start()
 
         # Wait for completion
         return_code = transcode_process.wait()
+        progress_thread.join(timeout=5)
 
         if return_code == 0 and Path(output_file).exists():
             with transcode_lock:
@@ -620,6 +658,9 @@ def transcode_video(input_file, output_file, delete_raw=True):
             with transcode_lock:
                 transcode_progress['status'] = 'error'
                 transcode_progress['is_processing'] = False
+            if stderr_tail:
+                output = b'\n'.join(stderr_tail).decode('utf-8', 'replace')
+                print(f"Transcode ffmpeg output (last {len(stderr_tail)} lines):\n{output}")
             return False, f"Transcode failed with return code {return_code}"
 
     except Exception as e:
@@ -633,24 +674,40 @@ def transcode_video(input_file, output_file, delete_raw=True):
             transcode_process = None
 
 
-def _read_transcode_progress(stderr, total_duration):
+def _read_transcode_progress(stderr, total_duration, tail):
     """
-    Read ffmpeg stderr and update progress
+    Read ffmpeg's binary stderr until it closes, updating progress (when the
+    total duration is known) and keeping the most recent lines in tail.
+    Lines stay bytes; only the tail is decoded, and only if it's reported.
     """
     global transcode_progress
 
-    time_pattern = re.compile(r'time=(\d+):(\d+):(\d+)\.(\d+)')
-
+    pending = b''
     try:
-        for line in stderr:
-            match = time_pattern.search(line)
-            if match:
-                hours, mins, secs, _ = map(int, match.groups())
-                current_time = hours * 3600 + mins * 60 + secs
-                progress = min(99, int((current_time / total_duration) * 100))
-
-                with transcode_lock:
-                    transcode_progress['progress_percent'] = progress
+        while True:
+            chunk = stderr.read1(TRANSCODE_READ_CHUNK)
+            if not chunk:
+                break
+            # ffmpeg ends progress lines with \r, everything else with \n
+            lines = _TRANSCODE_LINE_END.split(pending + chunk)
+            pending = lines.pop()
+            tail.extend(line for line in lines if line)
+
+            if not total_duration:
+                continue
+            # Only the newest progress line in the chunk matters
+            for line in reversed(lines):
+                match = _TRANSCODE_TIME_RE.search(line)
+                if match:
+                    hours, mins, secs, _ = map(int, match.groups())
+                    current_time = hours * 3600 + mins * 60 + secs
+                    progress = min(99, int((current_time / total_duration) * 100))
+
+                    with transcode_lock:
+                        transcode_progress['progress_percent'] = progress
+                    break
+        if pending:
+            tail.append(pending)
     except:
         pass  # Ignore read errors
 
@@ -716,6 +773,27 @@ def cancel_transcode():
 # File Management Functions
 # ============================================================================
 
+def _scan_mp4_files(directory):
+    """List the .mp4 files in a directory, newest name first (one stat per file)"""
+    try:
+        with os.scandir(directory) as it:
+            entries = [e for e in it if e.name.endswith('.mp4')]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.name, reverse=True)
+
+    files = []
+    for entry in entries:
+        stat = entry.stat()
+        files.append({
+            'name': entry.name,
+            'path': entry.path,
+            'size_mb': round(stat.st_size / (1024 * 1024), 2),
+            'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
+        })
+    return files
+
+
 def list_video_files():
     """
     List all video files in the storage directory
@@ -726,31 +804,8 @@ def list_video_files():
     config = get_camera_config()
     storage_path = Path(config['storage_path'])
 
-    raw_files = []
-    processed_files = []
-
-    raw_dir = storage_path / 'raw'
-    processed_dir = storage_path / 'processed'
-
-    if raw_dir.exists():
-        for f in sorted(raw_dir.glob('*.mp4'), reverse=True):
-            stat = f.stat()
-            raw_files.append({
-                'name': f.name,
-                'path': str(f),
-                'size_mb': round(stat.st_size / (1024 * 1024), 2),
-                'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-            })
-
-    if processed_dir.exists():
-        for f in sorted(processed_dir.glob('*.mp4'), reverse=True):
-            stat = f.stat()
-            processed_files.append({
-                'name': f.name,
-                'path': str(f),
-                'size_mb': round(stat.st_size / (1024 * 1024), 2),
-                'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-            })
+    raw_files = _scan_mp4_files(storage_path / 'raw')
+    processed_files = _scan_mp4_files(storage_path / 'processed')
 
     return {
         'raw': raw_files,